@@ -0,0 +1,179 @@
+"""Benchmark :mod:`app.db` under concurrent interaction load.
+
+Simulates ``--users`` concurrent users, each issuing ``--ops`` storage calls in
+the mix the playtest cog produces (menu clicks read saved regions, submits
+write regions and playtests, ``/update-playtest`` reads a playtest), against a
+fresh database in a temp directory. Reports throughput and p50/p95/p99 latency
+per operation and optionally writes the results as JSON for run-to-run
+comparison::
+
+    uv run python benchmarks/db_bench.py --users 50 --ops 200 --output db.json
+    uv run python benchmarks/db_bench.py --write-behind --output db-wb.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import random
+import sqlite3
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from pathlib import Path
+
+from app import db
+
+REGIONS = ["Tester | EU", "Tester | NA", "Tester | Asia", "Tester | OCE"]
+
+# Relative weight of each operation in the simulated workload.
+OP_WEIGHTS = {
+    "get_user_regions": 50,
+    "get_playtest": 25,
+    "set_user_regions": 15,
+    "set_playtest": 10,
+}
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(pct / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+async def _seed(users: int, playtests: int, rng: random.Random) -> None:
+    for user_id in range(users):
+        await db.set_user_regions(user_id, rng.sample(REGIONS, 2))
+    for message_id in range(playtests):
+        await db.set_playtest(
+            rng.randrange(users), message_id, rng.sample(REGIONS, 2), "seed", ""
+        )
+    await db.flush()
+
+
+async def _user(
+    user_id: int,
+    ops: int,
+    playtests: int,
+    rng: random.Random,
+    latencies: dict[str, list[float]],
+) -> None:
+    names = list(OP_WEIGHTS)
+    weights = list(OP_WEIGHTS.values())
+    for _ in range(ops):
+        op = rng.choices(names, weights)[0]
+        start = time.perf_counter()
+        if op == "get_user_regions":
+            await db.get_user_regions(user_id)
+        elif op == "set_user_regions":
+            await db.set_user_regions(user_id, rng.sample(REGIONS, 2))
+        elif op == "get_playtest":
+            await db.get_playtest(rng.randrange(playtests))
+        else:
+            await db.set_playtest(
+                user_id, rng.randrange(playtests), rng.sample(REGIONS, 2), "bench", ""
+            )
+        latencies[op].append((time.perf_counter() - start) * 1000)
+
+
+async def run(args: argparse.Namespace) -> dict:
+    rng = random.Random(args.seed)
+    latencies: dict[str, list[float]] = defaultdict(list)
+    with tempfile.TemporaryDirectory() as tmp:
+        await db.init_db(
+            str(Path(tmp) / "bench.db"),
+            read_pool_size=args.read_pool,
+            write_behind=args.write_behind,
+            region_cache_size=args.region_cache_size,
+        )
+        try:
+            await _seed(args.users, args.playtests, rng)
+            start = time.perf_counter()
+            await asyncio.gather(
+                *(
+                    _user(
+                        user_id,
+                        args.ops,
+                        args.playtests,
+                        random.Random(rng.random()),
+                        latencies,
+                    )
+                    for user_id in range(args.users)
+                )
+            )
+            # Queued write-behind writes are part of the work being measured.
+            await db.flush()
+            elapsed = time.perf_counter() - start
+        finally:
+            await db.close_db()
+
+    results = {}
+    for op, values in sorted(latencies.items()):
+        values.sort()
+        results[op] = {
+            "count": len(values),
+            "ops_per_sec": len(values) / elapsed,
+            "p50_ms": percentile(values, 50),
+            "p95_ms": percentile(values, 95),
+            "p99_ms": percentile(values, 99),
+            "max_ms": values[-1],
+        }
+    total = sum(len(v) for v in latencies.values())
+    return {
+        "benchmark": "db",
+        "timestamp": time.time(),
+        "environment": {
+            "python": sys.version.split()[0],
+            "sqlite": sqlite3.sqlite_version,
+            "platform": platform.platform(),
+        },
+        "config": {k: v for k, v in vars(args).items() if k != "output"},
+        "elapsed_sec": elapsed,
+        "total_ops": total,
+        "ops_per_sec": total / elapsed,
+        "operations": results,
+    }
+
+
+def print_report(report: dict) -> None:
+    print(
+        f"{report['total_ops']} ops in {report['elapsed_sec']:.2f}s "
+        f"({report['ops_per_sec']:.0f} ops/s)"
+    )
+    print(
+        f"{'operation':<18}{'count':>8}{'ops/s':>10}"
+        f"{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+    )
+    for op, r in report["operations"].items():
+        print(
+            f"{op:<18}{r['count']:>8}{r['ops_per_sec']:>10.0f}"
+            f"{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}{r['p99_ms']:>9.2f}"
+        )
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--users", type=int, default=50)
+    parser.add_argument("--ops", type=int, default=200, help="operations per user")
+    parser.add_argument("--playtests", type=int, default=500, help="rows to seed")
+    parser.add_argument("--read-pool", type=int, default=4)
+    parser.add_argument("--region-cache-size", type=int, default=1024)
+    parser.add_argument("--write-behind", action="store_true")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--output", help="write machine-readable results here")
+    args = parser.parse_args()
+
+    report = asyncio.run(run(args))
+    print_report(report)
+    if args.output:
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,100 @@
+"""Micro-benchmark experience payload decoding and parsing.
+
+For every payload in ``benchmarks/corpus/`` measures the time to decode the
+body and run :func:`parse_experience`, the peak memory allocated while doing so
+and the memory retained by the resulting :class:`Experience`::
+
+    uv run python benchmarks/experience_bench.py --output parse.json
+    uv run python benchmarks/experience_bench.py --stdlib-json   # force json.loads
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from app.cogs.playtest import experience
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+
+
+def parse(body: bytes, decode):
+    # Undecodable bodies degrade to "no experience", as in the lookup path.
+    try:
+        payload = decode(body)
+    except ValueError:
+        return None
+    return experience.parse_experience(payload)
+
+
+def bench_payload(body: bytes, decode, min_time: float) -> dict:
+    # Calibrate the iteration count so each payload runs for about min_time.
+    iterations = 0
+    start = time.perf_counter()
+    while time.perf_counter() - start < min_time or iterations < 5:
+        parse(body, decode)
+        iterations += 1
+    per_call = (time.perf_counter() - start) / iterations
+
+    tracemalloc.start()
+    parsed = parse(body, decode)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del parsed
+
+    return {
+        "bytes": len(body),
+        "iterations": iterations,
+        "parse_ms": per_call * 1000,
+        "mb_per_sec": len(body) / per_call / 1e6,
+        "peak_alloc_bytes": peak,
+        "retained_bytes": retained,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--stdlib-json", action="store_true", help="decode with json.loads"
+    )
+    parser.add_argument(
+        "--min-time", type=float, default=1.0, help="seconds per payload"
+    )
+    parser.add_argument("--output", help="write machine-readable results here")
+    args = parser.parse_args()
+
+    decode = json.loads if args.stdlib_json else experience.decode_payload
+    decoder = "json" if args.stdlib_json or experience.orjson is None else "orjson"
+
+    results = {}
+    for path in sorted(CORPUS_DIR.glob("*.json")):
+        results[path.stem] = bench_payload(path.read_bytes(), decode, args.min_time)
+
+    print(f"decoder: {decoder}")
+    print(
+        f"{'payload':<22}{'bytes':>10}{'ms/parse':>10}{'MB/s':>8}"
+        f"{'peak KiB':>10}{'kept B':>8}"
+    )
+    for name, r in results.items():
+        print(
+            f"{name:<22}{r['bytes']:>10}{r['parse_ms']:>10.3f}{r['mb_per_sec']:>8.1f}"
+            f"{r['peak_alloc_bytes'] / 1024:>10.0f}{r['retained_bytes']:>8}"
+        )
+    if args.output:
+        report = {
+            "benchmark": "experience_parse",
+            "timestamp": time.time(),
+            "python": sys.version.split()[0],
+            "decoder": decoder,
+            "payloads": results,
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,209 @@
+"""Fuzz :func:`parse_experience` and :func:`build_experience_embed`.
+
+Takes the decodable payloads in ``benchmarks/corpus/``, applies random
+structural mutations (type swaps, deleted keys, duplicated or emptied lists,
+extra nesting) biased towards the fields the parser reads, plus byte-level
+corruption of the raw body, and checks that for every case:
+
+- parsing never raises (an undecodable body may fail to decode, nothing else);
+- a parsed experience renders to an embed within Discord's size limits;
+- parsing takes no longer than ``--time-factor`` times the unmutated payload.
+
+Runs are reproducible from ``--seed``; failing cases are printed with their
+seed and written to ``--save-failures`` if given. Exits 1 on any failure::
+
+    uv run python benchmarks/fuzz_parse.py --iterations 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import sys
+import time
+from pathlib import Path
+
+from app.cogs.playtest import experience
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+
+# Keys parse_experience looks at; mutations favour these and their children.
+PARSED_KEYS = frozenset(
+    {
+        "result", "name", "configDescription", "likes", "playElementDesign",
+        "mapRotation", "maps", "levelName", "mapname", "image", "teamComposition",
+        "teams", "capacity", "updated", "seconds", "tags", "translation",
+        "translations", "kind", "localizedText",
+    }
+)  # fmt: skip
+
+# Minimum time bound, so tiny payloads aren't failed over timer noise.
+MIN_BOUND = 0.002
+
+
+def _values(rng: random.Random) -> list:
+    return [
+        None,
+        True,
+        0,
+        -1,
+        10**30,
+        1.5,
+        "",
+        "6",
+        "x" * rng.choice([1, 300, 10_000]),
+        [],
+        {},
+        [None],
+        {"result": []},
+    ]
+
+
+def _slots(node, parent_key=None) -> list[tuple[object, object, object]]:
+    """Every (container, key, parent key) position in a decoded JSON tree."""
+    slots = []
+    stack = [(node, parent_key)]
+    while stack:
+        container, parent = stack.pop()
+        if isinstance(container, dict):
+            items = container.items()
+        elif isinstance(container, list):
+            items = enumerate(container)
+        else:
+            continue
+        for key, child in items:
+            slots.append((container, key, parent))
+            stack.append((child, key if isinstance(key, str) else parent))
+    return slots
+
+
+def mutate(payload: dict, rng: random.Random) -> None:
+    """Apply one random mutation to ``payload`` in place."""
+    slots = _slots(payload)
+    if not slots:
+        return
+    focused = [s for s in slots if s[1] in PARSED_KEYS or s[2] in PARSED_KEYS]
+    if focused and rng.random() < 0.8:
+        slots = focused
+    container, key, _ = rng.choice(slots)
+    value = container[key]
+    op = rng.randrange(5)
+    if op == 0:
+        container[key] = rng.choice(_values(rng))
+    elif op == 1 and isinstance(container, dict):
+        del container[key]
+    elif op == 2 and isinstance(value, list) and value:
+        value.extend(rng.choices(value, k=rng.randint(1, 3)))
+    elif op == 3 and isinstance(value, (list, dict)):
+        value.clear()
+    else:
+        container[key] = rng.choice([[value], {"value": value}, str(value)[:50]])
+
+
+def corrupt(body: bytes, rng: random.Random) -> bytes:
+    """Truncate the body or flip a few of its bytes."""
+    if rng.random() < 0.5:
+        return body[: rng.randrange(len(body))]
+    data = bytearray(body)
+    for _ in range(rng.randint(1, 8)):
+        data[rng.randrange(len(data))] = rng.randrange(256)
+    return bytes(data)
+
+
+def check_embed(parsed: experience.Experience) -> str | None:
+    embed = experience.build_experience_embed(parsed)
+    experience.embed_hash(embed)
+    if len(embed) > 6000:
+        return f"embed is {len(embed)} characters"
+    if len(embed.title or "") > 256 or len(embed.description or "") > 4096:
+        return "embed title or description over limit"
+    for field in embed.fields:
+        if len(field.value or "") > 1024:
+            return f"field {field.name!r} is {len(field.value)} characters"
+    return None
+
+
+def timed_parse(payload) -> tuple[experience.Experience | None, float]:
+    start = time.perf_counter()
+    parsed = experience.parse_experience(payload)
+    return parsed, time.perf_counter() - start
+
+
+def run_case(body: bytes, rng: random.Random, bound: float, mutations: int):
+    """Run one fuzz case; returns (failure message or None, mutated input)."""
+    if rng.random() < 0.2:
+        body = corrupt(body, rng)
+        try:
+            payload = experience.decode_payload(body)
+        except ValueError:
+            return None, body
+    else:
+        payload = experience.decode_payload(body)
+        for _ in range(rng.randint(1, mutations)):
+            mutate(payload, rng)
+
+    try:
+        parsed, elapsed = timed_parse(payload)
+        if elapsed > bound:
+            # Retry before blaming the payload for a GC pause or scheduler hiccup.
+            elapsed = min(timed_parse(payload)[1] for _ in range(3))
+        if elapsed > bound:
+            took = f"{elapsed * 1000:.2f} ms (bound {bound * 1000:.2f})"
+            return f"parse took {took}", payload
+        if parsed is not None:
+            problem = check_embed(parsed)
+            if problem:
+                return problem, payload
+    except Exception as exc:
+        return f"raised {exc!r}", payload
+    return None, payload
+
+
+def baseline(body: bytes) -> float:
+    payload = experience.decode_payload(body)
+    return min(timed_parse(payload)[1] for _ in range(5))
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--iterations", type=int, default=300, help="per payload")
+    parser.add_argument("--mutations", type=int, default=4, help="max per case")
+    parser.add_argument("--time-factor", type=float, default=5.0)
+    parser.add_argument("--max-bytes", type=int, default=512 * 1024)
+    parser.add_argument("--save-failures", help="directory for failing inputs")
+    args = parser.parse_args()
+
+    failures = 0
+    for path in sorted(CORPUS_DIR.glob("*.json")):
+        body = path.read_bytes()
+        if len(body) > args.max_bytes:
+            continue
+        try:
+            bound = max(baseline(body) * args.time_factor, MIN_BOUND)
+        except ValueError:
+            continue  # not JSON; covered by corrupting the other payloads
+        for i in range(args.iterations):
+            rng = random.Random(f"{args.seed}:{path.stem}:{i}")
+            problem, mutated = run_case(body, rng, bound, args.mutations)
+            if problem is None:
+                continue
+            failures += 1
+            print(f"FAIL {path.stem} case {i} (--seed {args.seed}): {problem}")
+            if args.save_failures:
+                out = Path(args.save_failures)
+                out.mkdir(parents=True, exist_ok=True)
+                name = out / f"{path.stem}-{args.seed}-{i}.json"
+                if isinstance(mutated, bytes):
+                    name.write_bytes(mutated)
+                else:
+                    name.write_text(json.dumps(mutated, default=repr))
+        print(f"{path.stem}: {args.iterations} cases, bound {bound * 1000:.2f} ms")
+
+    print(f"{failures} failure(s)")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
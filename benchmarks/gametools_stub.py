@@ -0,0 +1,87 @@
+"""A local stand-in for the gametools ``shared_playground`` endpoint.
+
+Replays payloads from ``benchmarks/corpus/`` and can inject the failures the
+experience client has to cope with, chosen by the experience code requested:
+
+- ``E429``: 429 with ``Retry-After: 1``
+- ``E404``/``E500``/``E503``: that status
+- ``FLAKY``: 503 for the first ``--flaky-failures`` requests, then a payload
+- ``SLOW``: a payload after ``--slow-delay`` seconds (trips client timeouts)
+- the name of a corpus file (e.g. ``HUGE_ROTATION``, ``MALFORMED_TYPES``):
+  that file, byte for byte
+- ``NONE``: an empty result (unknown code)
+- any other code: the corpus payload named by ``--payload``
+
+Point the bot (or a benchmark) at it with::
+
+    uv run python benchmarks/gametools_stub.py --port 8080
+    PLAYTEST_COG_SETTINGS__EXPERIENCE_API_URL=http://127.0.0.1:8080/bf6/shared_playground/
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+from collections import Counter
+from pathlib import Path
+
+from aiohttp import web
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+ROUTE = "/bf6/shared_playground/"
+EMPTY_RESULT = b'{"result": []}'
+
+
+def make_app(
+    *, payload: str = "typical", flaky_failures: int = 2, slow_delay: float = 15.0
+) -> web.Application:
+    corpus = {
+        path.stem.upper(): path.read_bytes() for path in CORPUS_DIR.glob("*.json")
+    }
+    body = corpus[payload.upper()]
+    hits: Counter[str] = Counter()
+
+    async def shared_playground(request: web.Request) -> web.Response:
+        code = request.query.get("experiencecode", "").upper()
+        hits[code] += 1
+        if code == "E429":
+            return web.Response(status=429, headers={"Retry-After": "1"})
+        if code in ("E404", "E500", "E503"):
+            return web.Response(status=int(code[1:]))
+        if code == "FLAKY" and hits[code] <= flaky_failures:
+            return web.Response(status=503)
+        if code == "SLOW":
+            await asyncio.sleep(slow_delay)
+        if code == "NONE":
+            return web.Response(body=EMPTY_RESULT, content_type="application/json")
+        return web.Response(
+            body=corpus.get(code, body), content_type="application/json"
+        )
+
+    async def stats(request: web.Request) -> web.Response:
+        return web.json_response(dict(hits))
+
+    app = web.Application()
+    app.router.add_get(ROUTE, shared_playground)
+    app.router.add_get("/stats", stats)
+    return app
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--payload", default="typical", help="corpus file stem")
+    parser.add_argument("--flaky-failures", type=int, default=2)
+    parser.add_argument("--slow-delay", type=float, default=15.0)
+    args = parser.parse_args()
+    app = make_app(
+        payload=args.payload,
+        flaky_failures=args.flaky_failures,
+        slow_delay=args.slow_delay,
+    )
+    web.run_app(app, host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,168 @@
+"""Regenerate the gametools payload corpus in ``benchmarks/corpus/``.
+
+The payloads mirror the shape of ``/bf6/shared_playground/`` responses,
+including the bulky fields the bot never renders (mutators, asset categories,
+per-kind tag translations), at a range of sizes. Alongside the valid ones are
+the other answers the client has to survive: an empty result (unknown code),
+a rotation close to :data:`MAX_PAYLOAD_BYTES`, and malformed bodies (wrong
+field types, unexpected nesting, truncated JSON). Output is deterministic, so
+the checked-in files only change when this script does::
+
+    uv run python benchmarks/make_corpus.py
+"""
+
+from __future__ import annotations
+
+import json
+import random
+from pathlib import Path
+
+from app.cogs.playtest.experience import LEVEL_NAMES, MAX_PAYLOAD_BYTES
+
+CORPUS_DIR = Path(__file__).parent / "corpus"
+
+LANGUAGES = (
+    "en-us", "de-de", "fr-fr", "es-es", "it-it", "pl-pl", "pt-br", "ru-ru",
+    "ja-jp", "ko-kr", "zh-tw", "zh-cn", "ar-sa", "tr-tr", "es-mx",
+)  # fmt: skip
+
+
+def _tag(rng: random.Random, index: int, languages: int) -> dict:
+    translations = []
+    for lang in LANGUAGES[:languages]:
+        for kind in ("1", "6", "7"):
+            translations.append(
+                {
+                    "kind": kind,
+                    "language": lang,
+                    "localizedText": f"Tag {index} ({lang}/{kind})",
+                }
+            )
+    rng.shuffle(translations)
+    return {
+        "id": f"tag-{index}",
+        "category": rng.choice(["Mode", "Rules", "Vehicles", "Misc"]),
+        "translation": {"id": f"TAG_{index}", "translations": translations},
+    }
+
+
+def _map(rng: random.Random, index: int, mutators: int) -> dict:
+    level = rng.choice(list(LEVEL_NAMES))
+    cap = rng.choice([16, 32, 64])
+    return {
+        "levelName": level,
+        "mapname": level.removeprefix("MP_"),
+        "image": f"https://cdn.gametools.network/maps/bf6/{level}.jpg",
+        "rounds": rng.randint(1, 3),
+        "allowedSpectators": 4,
+        "teamComposition": {
+            "teams": [
+                {"teamId": team, "capacity": cap, "internalTeams": [{"id": team}]}
+                for team in (1, 2)
+            ],
+        },
+        "mutators": [
+            {
+                "name": f"mutator_{index}_{m}",
+                "kind": rng.choice(["bool", "int", "float"]),
+                "value": {
+                    "boolValue": rng.random() > 0.5,
+                    "intValue": rng.randint(0, 100),
+                },
+            }
+            for m in range(mutators)
+        ],
+    }
+
+
+def make_payload(
+    seed: int, *, maps: int, tags: int, languages: int, mutators: int
+) -> dict:
+    rng = random.Random(seed)
+    design = {
+        "playgroundId": f"{seed:08x}-0000-0000-0000-000000000000",
+        "name": f"Corpus Experience {seed}",
+        "configDescription": "A generated experience for the replay corpus. " * 3,
+        "likes": rng.randint(0, 5000),
+        "owner": {"personaId": str(rng.getrandbits(40)), "platformId": 1},
+        "playElementDesign": {
+            "updated": {"seconds": 1_760_000_000 + seed, "nanos": 0},
+            "created": {"seconds": 1_750_000_000 + seed, "nanos": 0},
+            "mapRotation": {"maps": [_map(rng, i, mutators) for i in range(maps)]},
+            "tags": [_tag(rng, i, languages) for i in range(tags)],
+            "assetCategories": [
+                {"tagId": f"asset-{i}", "boolean": {"defaultValue": bool(i % 2)}}
+                for i in range(mutators * 4)
+            ],
+        },
+    }
+    return {
+        "result": [
+            {"result": [design], "originalPlayground": design["playgroundId"]}
+        ]
+    }
+
+
+def _wrong_types() -> dict:
+    """Every field the parser reads, present but with an unexpected type."""
+    payload = make_payload(3, maps=4, tags=3, languages=1, mutators=1)
+    design = payload["result"][0]["result"][0]
+    design["name"] = ["not", "a", "string"]
+    design["likes"] = "lots"
+    play = design["playElementDesign"]
+    play["updated"] = {"seconds": "yesterday"}
+    maps = play["mapRotation"]["maps"]
+    maps[0]["teamComposition"]["teams"] = [{"capacity": "32"}, {"capacity": None}]
+    maps[1]["levelName"] = 42
+    maps[1]["image"] = {"url": "https://example.invalid/map.jpg"}
+    maps[2]["teamComposition"] = "32v32"
+    maps.append("MP_Dumbo")
+    play["tags"][0]["translation"] = None
+    play["tags"][1]["translation"]["translations"] = {"kind": "6"}
+    play["tags"].append(7)
+    return payload
+
+
+def _unexpected_nesting() -> dict:
+    """Known keys at the wrong level: ``result`` is an object, not a list."""
+    payload = make_payload(4, maps=2, tags=2, languages=1, mutators=1)
+    return {"result": payload["result"][0]}
+
+
+# name -> payload parameters
+SPECS = {
+    "typical": dict(seed=1, maps=3, tags=4, languages=1, mutators=5),
+    "large_rotation": dict(seed=2, maps=120, tags=40, languages=15, mutators=30),
+    "huge_rotation": dict(seed=5, maps=400, tags=100, languages=15, mutators=40),
+}
+
+# name -> payload built by hand
+FIXTURES = {
+    "empty_result": lambda: {"result": []},
+    "malformed_types": _wrong_types,
+    "malformed_nesting": _unexpected_nesting,
+}
+
+
+def _dump(payload: dict) -> bytes:
+    return json.dumps(payload, separators=(",", ":")).encode()
+
+
+def main() -> None:
+    CORPUS_DIR.mkdir(exist_ok=True)
+    bodies = {name: _dump(make_payload(**spec)) for name, spec in SPECS.items()}
+    bodies |= {name: _dump(build()) for name, build in FIXTURES.items()}
+    # A response cut off mid-stream; not valid JSON at all.
+    typical = bodies["typical"]
+    bodies["malformed_truncated"] = typical[: len(typical) // 2]
+
+    for name, body in bodies.items():
+        if len(body) > MAX_PAYLOAD_BYTES:
+            raise SystemExit(f"{name} is over MAX_PAYLOAD_BYTES ({len(body)} bytes)")
+        path = CORPUS_DIR / f"{name}.json"
+        path.write_bytes(body)
+        print(f"wrote {path} ({len(body)} bytes)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""Benchmark the full experience lookup against replayed gametools responses.
+
+Starts :mod:`gametools_stub` in-process (or uses ``--url``) and, for every
+payload in ``benchmarks/corpus/``, runs the path a lookup takes after a cache
+miss: download the body, decode, :func:`parse_experience`, then
+:func:`build_experience_embed` and :func:`embed_hash`. Reports throughput,
+p50/p95 latency and the peak memory allocated by one lookup::
+
+    uv run python benchmarks/replay_bench.py --requests 200 --concurrency 8
+    uv run python benchmarks/replay_bench.py --url http://127.0.0.1:8080/bf6/shared_playground/
+
+With the in-process server, memory figures include the server's side of the
+request; run the stub separately and pass ``--url`` to exclude it.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+from aiohttp import web
+
+from app.cogs.playtest import experience
+from gametools_stub import CORPUS_DIR, ROUTE, make_app
+
+
+async def lookup(code: str) -> bool:
+    """One uncached lookup; returns whether it produced an embed."""
+    try:
+        body = await experience._download(code)
+        if body is None:
+            return False
+        parsed = experience.parse_experience(experience.decode_payload(body))
+    except (experience.PayloadTooLarge, ValueError):
+        parsed = None
+    if parsed is None:
+        return False
+    experience.embed_hash(experience.build_experience_embed(parsed))
+    return True
+
+
+async def bench_code(code: str, requests: int, concurrency: int) -> dict:
+    latencies: list[float] = []
+    queue: asyncio.Queue[None] = asyncio.Queue()
+    for _ in range(requests):
+        queue.put_nowait(None)
+
+    async def worker() -> None:
+        while not queue.empty():
+            queue.get_nowait()
+            start = time.perf_counter()
+            await lookup(code)
+            latencies.append(time.perf_counter() - start)
+
+    await lookup(code)  # warm the connection pool
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - start
+
+    tracemalloc.start()
+    embedded = await lookup(code)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    latencies.sort()
+    return {
+        "embed": embedded,
+        "requests": requests,
+        "per_sec": requests / elapsed,
+        "p50_ms": statistics.median(latencies) * 1000,
+        "p95_ms": latencies[int(len(latencies) * 0.95) - 1] * 1000,
+        "peak_alloc_bytes": peak,
+    }
+
+
+async def run(args: argparse.Namespace) -> dict:
+    runner = None
+    url = args.url
+    if url is None:
+        runner = web.AppRunner(make_app(), access_log=None)
+        await runner.setup()
+        site = web.TCPSite(runner, "127.0.0.1", 0)
+        await site.start()
+        port = runner.addresses[0][1]
+        url = f"http://127.0.0.1:{port}{ROUTE}"
+
+    # No rate limiting or retries: measure the pipeline, not the protections
+    # (tests/test_experience_resilience.py covers those against the stub).
+    experience.configure_requests(
+        api_url=url, rate=1e9, burst=10**6, max_attempts=1, failure_threshold=10**6
+    )
+    await experience.open_session(limit=args.concurrency)
+    try:
+        return {
+            path.stem: await bench_code(
+                path.stem.upper(), args.requests, args.concurrency
+            )
+            for path in sorted(CORPUS_DIR.glob("*.json"))
+        }
+    finally:
+        await experience.close_session()
+        if runner is not None:
+            await runner.cleanup()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--url", help="replay server endpoint (default: in-process)")
+    parser.add_argument("--requests", type=int, default=100, help="per payload")
+    parser.add_argument("--concurrency", type=int, default=4)
+    parser.add_argument("--output", help="write machine-readable results here")
+    args = parser.parse_args()
+
+    results = asyncio.run(run(args))
+
+    print(
+        f"{'payload':<22}{'embed':>6}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}"
+        f"{'peak KiB':>10}"
+    )
+    for name, r in results.items():
+        print(
+            f"{name:<22}{'yes' if r['embed'] else 'no':>6}{r['per_sec']:>9.1f}"
+            f"{r['p50_ms']:>9.2f}{r['p95_ms']:>9.2f}"
+            f"{r['peak_alloc_bytes'] / 1024:>10.0f}"
+        )
+    if args.output:
+        report = {
+            "benchmark": "experience_replay",
+            "timestamp": time.time(),
+            "python": sys.version.split()[0],
+            "decoder": "json" if experience.orjson is None else "orjson",
+            "concurrency": args.concurrency,
+            "payloads": results,
+        }
+        Path(args.output).write_text(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -5,11 +5,14 @@ from __future__ import annotations
 import logging
 import json
 
+# First, so the startup timeline includes importing everything else.
+from . import startup
 from .bot import Ranger
 from .config import env
 
 
 def start() -> None:
+    startup.mark("imported")
     logging.basicConfig(
         level=logging.INFO,
         format="%(asctime)s %(levelname)-8s %(name)s: %(message)s",
@@ -2,12 +2,15 @@
 
 A thin :class:`discord.ext.commands.Bot` subclass that initialises the database,
 auto-discovers cogs under ``app/cogs/`` and syncs application commands to the
-configured guild. Feature behaviour (persistent views, menus, commands) lives in
-the cogs themselves so this module stays generic.
+configured guild, recording a :mod:`startup <app.startup>` timeline as it goes.
+It also owns the :class:`TaskExecutor` that cogs submit background work to.
+Feature behaviour (persistent views, menus, commands) lives in the cogs
+themselves so this module stays generic.
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import json, math, time
 from pathlib import Path
@@ -15,8 +18,10 @@ from pathlib import Path
 import discord
 from discord.ext import commands, tasks
 
+from . import command_ids, metrics, startup
 from .config import env
-from .db import init_db
+from .db import close_db, init_db, prune_playtests, region_cache_stats
+from .executor import TaskExecutor
 
 log = logging.getLogger(__name__)
 
@@ -26,11 +31,18 @@ COGS_DIR = Path(__file__).parent / "cogs"
 class Ranger(commands.Bot):
     def __init__(self, **options) -> None:
         intents = discord.Intents.default()
+        # Time every Discord REST call.
+        options.setdefault("http_trace", metrics.http_trace())
         super().__init__(
             command_prefix=commands.when_mentioned,
             intents=intents,
             **options,
         )
+        self.executor = TaskExecutor(
+            workers=env.BOT_SETTINGS.EXECUTOR_WORKERS,
+            queue_size=env.BOT_SETTINGS.EXECUTOR_QUEUE_SIZE,
+            name="background",
+        )
 
     def write_health_state(self) -> None:
         """Write the current health state for the Docker health probe"""
@@ -57,19 +69,108 @@ class Ranger(commands.Bot):
         except Exception:
             log.exception("Failed to update the health state")
 
+    @tasks.loop(hours=6)
+    async def retention_loop(self) -> None:
+        settings = env.BOT_SETTINGS
+        older_than = int(settings.DB_RETENTION_DAYS * 86400)
+        try:
+            await prune_playtests(
+                older_than,
+                batch_size=settings.DB_RETENTION_BATCH_SIZE,
+                archive=settings.DB_ARCHIVE_PATH,
+            )
+        except Exception:
+            log.exception("Failed to prune old playtests")
+
+    async def login(self, token: str) -> None:
+        with startup.stage("login"):
+            await super().login(token)
+
     async def setup_hook(self) -> None:
-        await init_db(env.BOT_SETTINGS.DB_PATH)
-        await self._load_cogs()
+        self.executor.start()
+        metrics.register_stats(
+            "ranger_db_region_cache", region_cache_stats, "Region cache counters."
+        )
+        metrics.register_stats(
+            "ranger_executor", self.executor.stats, "Background executor counters."
+        )
+        metrics.register_stats(
+            "ranger_startup",
+            startup.startup_stats,
+            "Seconds from process start until a startup stage ended.",
+        )
+        # The metrics endpoint comes up alongside the database and the cogs,
+        # which load once the database is open so cog_load may use it. A failure
+        # is re-raised as itself rather than as the TaskGroup's ExceptionGroup.
+        try:
+            async with asyncio.TaskGroup() as group:
+                group.create_task(self._start_metrics())
+                group.create_task(self._open_db_and_load_cogs())
+        except* Exception as errors:
+            raise errors.exceptions[0] from None
 
         guild = discord.Object(id=env.BOT_SETTINGS.GUILD_ID)
         self.tree.copy_global_to(guild=guild)
-        await self.tree.sync(guild=guild)
-        log.info("Synced application commands to guild %s", env.BOT_SETTINGS.GUILD_ID)
+        with startup.stage("sync"):
+            await command_ids.sync(
+                self.tree, guild, force=env.BOT_SETTINGS.FORCE_COMMAND_SYNC
+            )
 
         # self.health_loop.change_interval(seconds = env.BOT_SETTINGS.HEALTH_HEARTBEAT_INTERVAL)
         self.health_loop.start()
+        if env.BOT_SETTINGS.DB_RETENTION_DAYS:
+            self.retention_loop.start()
+
+    async def close(self) -> None:
+        # Let background work (queued jobs, and tracked tasks such as playtest
+        # flows still finishing after their reply) finish while the connection
+        # and database are still up. Cogs are then unloaded by the base class, so
+        # nothing touches the database after queued writes are flushed and the
+        # pool is closed.
+        try:
+            await self.executor.drain(env.BOT_SETTINGS.EXECUTOR_DRAIN_TIMEOUT)
+            await super().close()
+        finally:
+            await metrics.stop_server()
+            await close_db()
+
+    async def _open_db(self) -> None:
+        with startup.stage("db"):
+            await init_db(
+                env.BOT_SETTINGS.DB_PATH,
+                read_pool_size=env.BOT_SETTINGS.DB_READ_POOL_SIZE,
+                cache_size_kib=env.BOT_SETTINGS.DB_CACHE_SIZE_KIB,
+                mmap_size=env.BOT_SETTINGS.DB_MMAP_SIZE,
+                write_behind=env.BOT_SETTINGS.DB_WRITE_BEHIND,
+                flush_interval=env.BOT_SETTINGS.DB_FLUSH_INTERVAL,
+                flush_batch_size=env.BOT_SETTINGS.DB_FLUSH_BATCH_SIZE,
+                region_cache_size=env.BOT_SETTINGS.DB_REGION_CACHE_SIZE,
+                warm_region_cache=env.BOT_SETTINGS.DB_REGION_CACHE_WARM,
+            )
+            await command_ids.load()
+
+    async def _open_db_and_load_cogs(self) -> None:
+        await self._open_db()
+        await self._load_cogs()
+
+    async def _start_metrics(self) -> None:
+        settings = env.BOT_SETTINGS
+        if not settings.METRICS_PORT:
+            return
+        # The endpoint is optional: failing to bind mustn't abort the setup
+        # stages it runs alongside.
+        try:
+            with startup.stage("metrics"):
+                await metrics.start_server(settings.METRICS_HOST, settings.METRICS_PORT)
+        except OSError:
+            log.exception(
+                "Failed to serve metrics on %s:%s",
+                settings.METRICS_HOST,
+                settings.METRICS_PORT,
+            )
 
     async def _load_cogs(self) -> None:
+        extensions = []
         for path in sorted(COGS_DIR.iterdir()):
             if path.stem == "__init__":
                 continue
@@ -80,14 +181,22 @@ class Ranger(commands.Bot):
                 name = path.name
             else:
                 continue
-            ext = f"app.cogs.{name}"
-            try:
+            extensions.append(f"app.cogs.{name}")
+        # Cogs are independent of each other, so load them concurrently.
+        with startup.stage("cogs"):
+            await asyncio.gather(*(self._load_cog(ext) for ext in extensions))
+
+    async def _load_cog(self, ext: str) -> None:
+        try:
+            with startup.stage(f"cog {ext}"):
                 await self.load_extension(ext)
-                log.info("Loaded cog %s", ext)
-            except Exception:
-                log.exception("Failed to load cog %s", ext)
+            log.info("Loaded cog %s", ext)
+        except Exception:
+            log.exception("Failed to load cog %s", ext)
 
     async def on_ready(self) -> None:
+        startup.mark("ready")
         user = self.user
         await self.change_presence(status=discord.Status.online)
         log.info("Logged in as %s (id=%s)", user, user.id if user else "?")
+        startup.report()
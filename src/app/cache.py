@@ -0,0 +1,125 @@
+"""Small in-process caches shared across the bot."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from typing import Any, Generic, TypeVar
+
+K = TypeVar("K")
+V = TypeVar("V")
+
+
+class LRUCache(Generic[K, V]):
+    """A bounded least-recently-used mapping with hit/miss/eviction counters.
+
+    Not thread-safe; it's only touched from the bot's event loop.
+    """
+
+    def __init__(self, capacity: int) -> None:
+        self.capacity = max(capacity, 0)
+        self._data: OrderedDict[K, V] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: K) -> bool:
+        return key in self._data
+
+    def get(self, key: K, default: Any = None) -> V | Any:
+        """Return the cached value (marking it recently used), or ``default`` on
+        a miss."""
+        try:
+            value = self._data[key]
+        except KeyError:
+            self.misses += 1
+            return default
+        self._data.move_to_end(key)
+        self.hits += 1
+        return value
+
+    def put(self, key: K, value: V) -> None:
+        """Insert or replace a value, evicting the least recently used if full."""
+        if self.capacity == 0:
+            return
+        self._data[key] = value
+        self._data.move_to_end(key)
+        while len(self._data) > self.capacity:
+            self._data.popitem(last=False)
+            self.evictions += 1
+
+    def add(self, key: K, value: V) -> None:
+        """Insert a value only if the key isn't cached yet.
+
+        Used when filling the cache from a read that may have raced with a
+        newer write which already updated the cache.
+        """
+        if key not in self._data:
+            self.put(key, value)
+
+    def pop(self, key: K) -> V | None:
+        return self._data.pop(key, None)
+
+    def clear(self) -> None:
+        self._data.clear()
+
+    def stats(self) -> dict[str, int]:
+        return {
+            "size": len(self._data),
+            "capacity": self.capacity,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+        }
+
+
+class TTLCache(Generic[K, V]):
+    """A bounded LRU whose entries expire at a per-entry deadline.
+
+    Deadlines are wall-clock epoch seconds (``time.time`` by default) so they can
+    be persisted and restored across restarts. ``None`` is a valid cached value,
+    so :meth:`get` takes an explicit ``default`` for misses.
+    """
+
+    def __init__(self, capacity: int, clock: Callable[[], float] = time.time) -> None:
+        self._lru: LRUCache[K, tuple[V, float]] = LRUCache(capacity)
+        self._clock = clock
+        self.expirations = 0
+
+    def __len__(self) -> int:
+        return len(self._lru)
+
+    @property
+    def capacity(self) -> int:
+        return self._lru.capacity
+
+    def get(self, key: K, default: Any = None) -> V | Any:
+        entry = self._lru.get(key)
+        if entry is None:
+            return default
+        value, expires_at = entry
+        if expires_at <= self._clock():
+            # Count it as a miss rather than the hit the LRU just recorded.
+            self._lru.pop(key)
+            self._lru.hits -= 1
+            self._lru.misses += 1
+            self.expirations += 1
+            return default
+        return value
+
+    def put(self, key: K, value: V, expires_at: float) -> None:
+        """Cache ``value`` until the ``expires_at`` deadline."""
+        self._lru.put(key, (value, expires_at))
+
+    def pop(self, key: K) -> None:
+        self._lru.pop(key)
+
+    def clear(self) -> None:
+        self._lru.clear()
+
+    def stats(self) -> dict[str, int]:
+        return self._lru.stats() | {"expirations": self.expirations}
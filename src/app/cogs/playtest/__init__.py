@@ -11,9 +11,37 @@ The package is laid out as:
 
 - :mod:`.cog` — the :class:`PlaytestCog`, slash commands and menu message.
 - :mod:`.announcements` — helpers that build/post/edit the announcement message.
+- :mod:`.resolver` — cached lookup of the configured channels and region roles.
+- :mod:`.pins` — deletes the pin notices in new playtest threads as they arrive.
+- :mod:`.experience` — experience lookups and the embed posted in each thread,
+  with :mod:`.resilience` guarding the upstream API.
 - :mod:`.ui` — the modals and the persistent menu view.
 """
 
-from .cog import PlaytestCog, setup
+from __future__ import annotations
+
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from discord.ext import commands
+
+    from .cog import PlaytestCog
 
 __all__ = ["PlaytestCog", "setup"]
+
+
+# The cog is imported lazily: the settings it reads require the bot's full
+# environment, and helpers such as :mod:`.experience` are usable without it
+# (the benchmarks import them directly).
+async def setup(bot: commands.Bot) -> None:
+    from .cog import setup as setup_cog
+
+    await setup_cog(bot)
+
+
+def __getattr__(name: str):
+    if name == "PlaytestCog":
+        from .cog import PlaytestCog
+
+        return PlaytestCog
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
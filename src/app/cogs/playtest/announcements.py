@@ -2,17 +2,26 @@
 
 Build, post and edit the plain-text announcement that pings the selected region
 roles when a playtest is scheduled or later updated.
+
+Edits go through the shared, rate-limited message-edit route, so they're kept to
+a minimum: an update whose rendered content hashes the same as what was posted
+is skipped, and concurrent updates of one message collapse into a single edit
+of the latest content.
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import logging
 from collections.abc import Iterable
+from typing import TYPE_CHECKING
 
 import discord
-from discord import TextChannel
 
-from ...config import env
+if TYPE_CHECKING:
+    from ...executor import TaskExecutor
 
 log = logging.getLogger(__name__)
 
@@ -28,8 +37,10 @@ EXPERIENCE_CODE_MAX_LENGTH = 6
 MAX_SNOWFLAKE_DIGITS = 20
 
 # Emoji and title pools for the announcement header. One of each is picked
-# independently but deterministically per playtest (seeded on the announcement
-# message id) so the header stays stable across edits.
+# independently but deterministically per playtest so the header stays stable
+# across edits. The seed is the id of the interaction that scheduled the
+# playtest (known before anything is posted) and is stored with the playtest;
+# playtests from before that was stored were seeded on their message id.
 ANNOUNCEMENT_EMOJIS = (
     "🚀",
     "⚡",
@@ -112,20 +123,6 @@ def description_char_budget(role_ids: Iterable[int]) -> int:
     return DISCORD_MESSAGE_LIMIT - announcement_overhead(role_ids)
 
 
-async def get_announcement_channel(guild: discord.Guild | None) -> TextChannel | None:
-    if not guild:
-        return None
-    try:
-        channel_id = env.PLAYTEST_COG_SETTINGS.ANNOUNCE_CHANNEL_ID
-        channel = guild.get_channel(channel_id) or await guild.fetch_channel(channel_id)
-        assert isinstance(channel, TextChannel)
-        return channel
-    except AssertionError:
-        log.exception("Announcement channel is not a TextChannel")
-
-    return None
-
-
 async def build_announcement_message(
     user_id: int,
     seed: int,
@@ -146,25 +143,96 @@ async def build_announcement_message(
     return lines
 
 
+def content_hash(*parts: object) -> str:
+    """Stable digest of rendered message content: text, embed dicts, components."""
+    rendered = json.dumps(parts, sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(rendered.encode()).hexdigest()
+
+
 async def send_announcement(
     user_id: int,
     channel: discord.abc.Messageable,
     roles: list[discord.Role],
     description: str,
     code: str,
-) -> discord.Message:
-    """Post the announcement as a plain text message (no embed)."""
-    mentions = discord.AllowedMentions(roles=roles or False)
-    # Post first so the message exists (its id also becomes the id of the thread
-    # created from it), then re-render the header seeded on that id for a stable,
-    # per-playtest header. Editing does not re-ping the roles.
-    lines = await build_announcement_message(user_id, user_id, description, code, roles)
-    message = await channel.send(content="\n".join(lines), allowed_mentions=mentions)
-    lines = await build_announcement_message(
-        user_id, message.id, description, code, roles
+    seed: int,
+) -> tuple[discord.Message, str]:
+    """Post the announcement as a plain text message (no embed), with its header
+    picked from ``seed``. Returns the message and its :func:`content_hash`."""
+    lines = await build_announcement_message(user_id, seed, description, code, roles)
+    content = "\n".join(lines)
+    message = await channel.send(
+        content=content,
+        allowed_mentions=discord.AllowedMentions(roles=roles or False),
     )
-    await message.edit(content="\n".join(lines), allowed_mentions=mentions)
-    return message
+    return message, content_hash(content)
+
+
+# Announcement message id -> (message, content, roles, future) for the latest
+# edit waiting to be applied, and the task applying edits to that message.
+_queued_edits: dict[
+    int, tuple[discord.Message, str, list[discord.Role], asyncio.Future[None]]
+] = {}
+_edit_workers: dict[int, asyncio.Task[None]] = {}
+_edit_counters = {"edits": 0, "skipped": 0, "coalesced": 0}
+# Tracks the edit workers so shutdown waits for them.
+_executor: TaskExecutor | None = None
+
+
+def configure_edits(*, executor: TaskExecutor | None) -> None:
+    global _executor
+    _executor = executor
+
+
+def edit_stats() -> dict[str, int]:
+    """Announcement edits made, skipped as unchanged and coalesced away."""
+    return dict(_edit_counters)
+
+
+async def _apply_edits(message_id: int) -> None:
+    try:
+        while (queued := _queued_edits.pop(message_id, None)) is not None:
+            message, content, roles, done = queued
+            _edit_counters["edits"] += 1
+            try:
+                await message.edit(
+                    content=content,
+                    allowed_mentions=discord.AllowedMentions(roles=roles or False),
+                )
+            except Exception as exc:
+                done.set_exception(exc)
+            else:
+                done.set_result(None)
+    finally:
+        _edit_workers.pop(message_id, None)
+
+
+async def _edit_coalesced(
+    message: discord.Message, content: str, roles: list[discord.Role]
+) -> None:
+    """Edit ``message`` to ``content``, merging with any edit still queued for it.
+
+    Edits of one message are applied one at a time. While one is in flight, later
+    ones wait in a single slot where each replaces the last, so a burst becomes
+    at most two edits. Every caller returns once content at least as new as its
+    own is applied, or raises if that edit failed.
+    """
+    queued = _queued_edits.get(message.id)
+    if queued is not None:
+        _edit_counters["coalesced"] += 1
+        done = queued[3]
+    else:
+        done = asyncio.get_running_loop().create_future()
+        # Mark a failure as retrieved even if every waiter was cancelled.
+        done.add_done_callback(lambda f: f.cancelled() or f.exception())
+    _queued_edits[message.id] = (message, content, roles, done)
+    if message.id not in _edit_workers:
+        worker = asyncio.create_task(_apply_edits(message.id))
+        _edit_workers[message.id] = worker
+        if _executor is not None:
+            _executor.track(worker)
+    # Shielded: the future is shared with other callers waiting on the same edit.
+    await asyncio.shield(done)
 
 
 async def update_announcement(
@@ -173,13 +241,21 @@ async def update_announcement(
     roles: list[discord.Role],
     description: str,
     code: str,
-) -> None:
-    """Edit the announcement to include the new details."""
-
-    lines = await build_announcement_message(
-        user_id, message.id, description, code, roles
-    )
-    await message.edit(
-        content="\n".join(lines),
-        allowed_mentions=discord.AllowedMentions(roles=roles or False),
-    )
+    seed: int,
+    *,
+    previous_hash: str | None = None,
+) -> str:
+    """Edit the announcement to include the new details and return its
+    :func:`content_hash`. Pass the seed it was posted with so the header doesn't
+    change, and the hash of its current content to skip an edit that wouldn't
+    change anything."""
+
+    lines = await build_announcement_message(user_id, seed, description, code, roles)
+    content = "\n".join(lines)
+    digest = content_hash(content)
+    if digest == previous_hash:
+        _edit_counters["skipped"] += 1
+        log.debug("Announcement %s unchanged; skipping edit", message.id)
+        return digest
+    await _edit_coalesced(message, content, roles)
+    return digest
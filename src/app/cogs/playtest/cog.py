@@ -2,20 +2,25 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
+import time
 
 import discord
-from discord import app_commands, TextChannel, Message
-from discord.ext import commands
+from discord import app_commands, Message
+from discord.ext import commands, tasks
 
-from ... import db
+from ... import db, metrics
 from ...config import env
-from .announcements import get_announcement_channel
+from . import announcements, experience, inflight, pins, resolver
+from .announcements import content_hash, edit_stats
 from .ui import PlaytestMenuView, UpdatePlaytestModal, build_playtest_modal
 
 log = logging.getLogger(__name__)
 
 MENU_STATE_KEY = "menu_message_id"
+# Hash of the menu's rendered embed and components, to skip no-op edits.
+MENU_HASH_STATE_KEY = "menu_message_hash"
 
 
 class PlaytestCog(commands.Cog):
@@ -26,24 +31,150 @@ class PlaytestCog(commands.Cog):
     async def cog_load(self) -> None:
         # Re-register the persistent view so the button keeps working after a restart.
         self.bot.add_view(PlaytestMenuView())
+        announcements.configure_edits(executor=self.bot.executor)
+        settings = env.PLAYTEST_COG_SETTINGS
+        await experience.open_session(
+            limit=settings.EXPERIENCE_HTTP_LIMIT,
+            dns_ttl=settings.EXPERIENCE_DNS_TTL,
+            keepalive=settings.EXPERIENCE_KEEPALIVE,
+        )
+        experience.configure_cache(
+            size=settings.EXPERIENCE_CACHE_SIZE,
+            ttl=settings.EXPERIENCE_CACHE_TTL,
+            negative_ttl=settings.EXPERIENCE_NEGATIVE_TTL,
+            max_persisted=settings.EXPERIENCE_CACHE_MAX_ROWS,
+        )
+        experience.configure_requests(
+            api_url=settings.EXPERIENCE_API_URL,
+            rate=settings.EXPERIENCE_RATE_LIMIT,
+            burst=settings.EXPERIENCE_RATE_BURST,
+            max_attempts=settings.EXPERIENCE_MAX_ATTEMPTS,
+            failure_threshold=settings.EXPERIENCE_BREAKER_THRESHOLD,
+            reset_timeout=settings.EXPERIENCE_BREAKER_RESET,
+        )
+        metrics.register_stats(
+            "ranger_experience_requests",
+            experience.request_stats,
+            "gametools API request counters.",
+        )
+        metrics.register_stats(
+            "ranger_experience_cache",
+            experience.experience_cache_stats,
+            "Experience cache counters.",
+        )
+        metrics.register_stats(
+            "ranger_experience_inflight",
+            experience.inflight_stats,
+            "Coalesced experience lookups.",
+        )
+        metrics.register_stats(
+            "ranger_announcement_edits", edit_stats, "Announcement edit counters."
+        )
+        metrics.register_stats(
+            "ranger_playtest_submissions",
+            inflight.inflight_stats,
+            "Playtest schedule and update counters.",
+        )
+        metrics.register_stats(
+            "ranger_pin_notices",
+            lambda: {"pending": pins.pending()},
+            "Threads waiting for their pin notice.",
+        )
+        if settings.EXPERIENCE_REFRESH_INTERVAL:
+            self.refresh_embeds.change_interval(
+                minutes=settings.EXPERIENCE_REFRESH_INTERVAL
+            )
+            self.refresh_embeds.start()
+
+    async def cog_unload(self) -> None:
+        self.refresh_embeds.cancel()
+        await experience.close_session()
+        # A reload picks up an edited regions file.
+        resolver.clear()
+
+    @tasks.loop(minutes=30)
+    async def refresh_embeds(self) -> None:
+        """Keep experience embeds in recently active playtest threads current."""
+        settings = env.PLAYTEST_COG_SETTINGS
+        since = int(time.time() - settings.EXPERIENCE_REFRESH_WINDOW_DAYS * 86400)
+        try:
+            playtests = await db.get_active_playtests(since)
+        except Exception:
+            log.exception("Failed to list playtests for embed refresh")
+            return
+        limit = asyncio.Semaphore(settings.EXPERIENCE_REFRESH_CONCURRENCY)
+
+        async def refresh(playtest: db.Playtest) -> bool:
+            async with limit:
+                try:
+                    return await experience.refresh_experience_embed(self.bot, playtest)
+                except Exception:
+                    log.exception("Failed to refresh playtest %s", playtest.message_id)
+                    return False
+
+        edited = await asyncio.gather(*(refresh(p) for p in playtests))
+        if playtests:
+            log.info(
+                "Refreshed experience embeds: %d of %d changed",
+                sum(edited),
+                len(playtests),
+            )
+
+    @refresh_embeds.before_loop
+    async def _before_refresh_embeds(self) -> None:
+        await self.bot.wait_until_ready()
 
     @commands.Cog.listener()
     async def on_ready(self) -> None:
         if self._menu_ensured:
             return
         self._menu_ensured = True
+        guild = self.bot.get_guild(env.BOT_SETTINGS.GUILD_ID)
+        if guild is not None:
+            resolver.report_missing_roles(guild)
         try:
             await self.ensure_menu_message()
         except Exception:
             self._menu_ensured = False
             log.exception("Failed to ensure the playtest menu message")
 
+    @commands.Cog.listener()
+    async def on_message(self, message: discord.Message) -> None:
+        if message.type is discord.MessageType.pins_add:
+            await pins.delete_if_expected(message)
+
+    # Drop cached channels and roles when they change so the next use resolves
+    # them again.
+    @commands.Cog.listener()
+    async def on_guild_channel_update(
+        self, before: discord.abc.GuildChannel, after: discord.abc.GuildChannel
+    ) -> None:
+        resolver.invalidate_channel(after.id)
+
+    @commands.Cog.listener()
+    async def on_guild_channel_delete(self, channel: discord.abc.GuildChannel) -> None:
+        resolver.invalidate_channel(channel.id)
+
+    @commands.Cog.listener()
+    async def on_guild_role_update(
+        self, before: discord.Role, after: discord.Role
+    ) -> None:
+        resolver.invalidate_role(after)
+
+    @commands.Cog.listener()
+    async def on_guild_role_delete(self, role: discord.Role) -> None:
+        resolver.invalidate_role(role)
+        if role.id in resolver.regions().values():
+            resolver.report_missing_roles(role.guild)
+
     @app_commands.command(
         name="schedule-playtest", description="Schedule a new playtest session"
     )
     async def schedule_playtest(self, interaction: discord.Interaction) -> None:
-        saved = await db.get_user_regions(interaction.user.id)
-        await interaction.response.send_modal(build_playtest_modal(saved))
+        with metrics.track_interaction("schedule-playtest", interaction):
+            saved = await db.get_user_regions(interaction.user.id)
+            await interaction.response.send_modal(build_playtest_modal(saved))
+            metrics.acked(interaction)
 
     @staticmethod
     def is_moderator(user: discord.User | discord.Member) -> bool:
@@ -57,6 +188,12 @@ class PlaytestCog(commands.Cog):
     )
     async def update_playtest(
         self, interaction: discord.Interaction
+    ) -> Message | None:
+        with metrics.track_interaction("update-playtest", interaction):
+            return await self._update_playtest(interaction)
+
+    async def _update_playtest(
+        self, interaction: discord.Interaction
     ) -> Message | None:
         try:
             channel = interaction.channel
@@ -79,7 +216,7 @@ class PlaytestCog(commands.Cog):
             )
 
         # Only the original scheduler or a moderator may update the playtest.
-        is_scheduler = str(interaction.user.id) == playtest.user_id
+        is_scheduler = interaction.user.id == playtest.user_id
         if not (is_scheduler or self.is_moderator(interaction.user)):
             return await interaction.response.send_message(
                 "Only the playtest's scheduler or a moderator can update it",
@@ -102,7 +239,9 @@ class PlaytestCog(commands.Cog):
             log.exception(msg)
             return await interaction.response.send_message(msg, ephemeral=True)
 
-        announcement_channel = await get_announcement_channel(interaction.guild)
+        announcement_channel = await resolver.get_announcement_channel(
+            interaction.guild
+        )
 
         if announcement_channel is None:
             return await interaction.response.send_message(
@@ -125,11 +264,12 @@ class PlaytestCog(commands.Cog):
         )
 
     async def ensure_menu_message(self) -> None:
-        """Post the menu message once, or edit the existing one on restart."""
-        channel_id = env.PLAYTEST_COG_SETTINGS.MENU_CHANNEL_ID
-        channel: TextChannel = self.bot.get_channel(
-            channel_id
-        ) or await self.bot.fetch_channel(channel_id)
+        """Post the menu message once, or edit the existing one on restart if its
+        content changed."""
+        channel = await resolver.get_menu_channel(self.bot)
+        if channel is None:
+            log.error("Menu channel unavailable; not posting the playtest menu")
+            return
 
         embed = discord.Embed(
             title="🎮 Playtest Scheduler",
@@ -141,12 +281,17 @@ class PlaytestCog(commands.Cog):
             color=discord.Color.blurple(),
         )
         view = PlaytestMenuView()
+        digest = content_hash(embed.to_dict(), view.to_components())
 
         stored = await db.get_state(MENU_STATE_KEY)
         if stored:
             try:
                 message = await channel.fetch_message(int(stored))
+                if digest == await db.get_state(MENU_HASH_STATE_KEY):
+                    log.info("Playtest menu message %s is up to date", stored)
+                    return
                 await message.edit(embed=embed, view=view)
+                await db.set_state(MENU_HASH_STATE_KEY, digest)
                 log.info("Refreshed existing playtest menu message %s", stored)
                 return
             except discord.NotFound:
@@ -154,6 +299,7 @@ class PlaytestCog(commands.Cog):
 
         message = await channel.send(embed=embed, view=view)
         await db.set_state(MENU_STATE_KEY, str(message.id))
+        await db.set_state(MENU_HASH_STATE_KEY, digest)
         log.info("Posted new playtest menu message %s", message.id)
 
 
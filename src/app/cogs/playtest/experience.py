@@ -4,20 +4,70 @@ Given an experience code entered when scheduling a playtest, fetch the shared
 playground metadata and render it as a Discord embed posted into the playtest
 thread. The upstream JSON is deeply nested and inconsistent, so parsing is
 defensive throughout and any failure degrades to "no embed".
+
+Lookups share one pooled :class:`aiohttp.ClientSession` (kept-alive connections,
+cached DNS) opened by :func:`open_session` when the cog loads and closed by
+:func:`close_session` when it unloads.
+
+Results are cached per normalized code, found and not-found with separate TTLs,
+in a bounded in-memory LRU backed by the ``experience_cache`` table so the cache
+survives restarts. Failed requests are never cached. Concurrent lookups of the
+same code share one upstream request ("single-flight").
+
+Requests are rate limited, retried with jittered backoff (honouring 429
+``Retry-After``) and guarded by a circuit breaker, see :mod:`.resilience`. A
+lookup that can't reach the API raises :class:`ExperienceUnavailable`, which is
+reported to users differently from an unknown code. A client error (such as a
+404) means the code is unknown and is cached as not found.
+
+Each posted embed is recorded against its playtest, so
+:func:`refresh_experience_embed` can later re-render it and edit the message only
+when the rendering changed.
 """
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
+import json
 import logging
+import time
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
 
 import aiohttp
 import discord
 
+try:
+    import orjson
+except ImportError:  # optional speed-up; the stdlib decoder works the same
+    orjson = None
+
+from ... import db, metrics
+from ...cache import TTLCache
+from .resilience import CircuitBreaker, TokenBucket, backoff_delay, retry_after
+
 log = logging.getLogger(__name__)
 
 API_URL = "https://api.gametools.network/bf6/shared_playground/"
 REQUEST_TIMEOUT = aiohttp.ClientTimeout(total=10)
 
+# Responses larger than this are abandoned rather than buffered and decoded; a
+# real experience, even with a long rotation, is far smaller.
+MAX_PAYLOAD_BYTES = 2 * 1024 * 1024
+
+# Upstream statuses worth retrying; any other error status fails immediately.
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+# Never wait longer than this between attempts, whatever Retry-After says.
+MAX_RETRY_DELAY = 30.0
+
+_session: aiohttp.ClientSession | None = None
+_api_url = API_URL
+_limiter = TokenBucket(rate=5, capacity=10)
+_breaker = CircuitBreaker(5, 30, name="gametools circuit")
+_max_attempts = 3
+_request_counters = {"requests": 0, "retries": 0}
+
 # Level id -> display name. Used as a fallback when the API returns the raw
 # level id (e.g. "MP_Aftermath_Portal") instead of a friendly map name.
 LEVEL_NAMES = {
@@ -48,30 +98,24 @@ LEVEL_NAMES = {
 }
 
 
+@dataclass(frozen=True, slots=True)
 class Experience:
-    """A parsed slice of the gametools experience payload."""
-
-    def __init__(
-        self,
-        name: str,
-        description: str,
-        maps: list[str],
-        tags: list[str],
-        likes: int,
-        image: str | None,
-        players: str | None,
-        updated: int | None,
-    ) -> None:
-        self.name = name
-        self.description = description
-        self.maps = maps
-        self.tags = tags
-        self.likes = likes
-        self.image = image
-        # Human-readable player count, e.g. "64 (32v32)", or None if unknown.
-        self.players = players
-        # Last-updated time as epoch seconds, or None if unknown.
-        self.updated = updated
+    """The slice of the gametools experience payload that we render.
+
+    Compact (``__slots__``, tuples) and immutable, since instances are shared
+    through the lookup cache.
+    """
+
+    name: str
+    description: str
+    maps: tuple[str, ...]
+    tags: tuple[str, ...]
+    likes: int
+    image: str | None
+    # Human-readable player count, e.g. "64 (32v32)", or None if unknown.
+    players: str | None
+    # Last-updated time as epoch seconds, or None if unknown.
+    updated: int | None
 
 
 def _first(seq: list | None) -> dict | None:
@@ -82,21 +126,44 @@ def _first(seq: list | None) -> dict | None:
     return None
 
 
+def _dict(value: object) -> dict:
+    return value if isinstance(value, dict) else {}
+
+
+def _list(value: object) -> list:
+    return value if isinstance(value, list) else []
+
+
+def _str(value: object) -> str:
+    return value.strip() if isinstance(value, str) else ""
+
+
+def _int(value: object) -> int | None:
+    """Coerce an int-ish value (the API sends both 64 and "64"), else None."""
+    if isinstance(value, bool):
+        return None
+    try:
+        return int(value)  # type: ignore[arg-type]
+    except (TypeError, ValueError, OverflowError):
+        return None
+
+
 def _friendly_map_name(entry: dict) -> str | None:
     """Resolve a map's display name.
 
     Our curated :data:`LEVEL_NAMES` is the source of truth; fall back to the
     API's ``mapname`` (or the raw level id) only for ids we don't have.
     """
-    level = (entry.get("levelName") or "").strip()
-    mapname = (entry.get("mapname") or "").strip()
+    level = _str(entry.get("levelName"))
+    mapname = _str(entry.get("mapname"))
     return LEVEL_NAMES.get(level) or mapname or level or None
 
 
 def _player_count(entry: dict) -> str | None:
     """Format a map's team capacities as "total (AvB)", e.g. "64 (32v32)"."""
-    teams = ((entry.get("teamComposition") or {}).get("teams")) or []
-    caps = [int(t["capacity"]) for t in teams if isinstance(t, dict) and t.get("capacity")]
+    teams = _list(_dict(entry.get("teamComposition")).get("teams"))
+    caps = [_int(_dict(t).get("capacity")) or 0 for t in teams]
+    caps = [c for c in caps if c > 0]
     if not caps:
         return None
     total = sum(caps)
@@ -107,114 +174,470 @@ def parse_experience(payload: dict) -> Experience | None:
     """Extract the useful fields from the gametools response.
 
     Returns ``None`` when the code is unknown (the API returns an empty
-    ``result`` list) or the payload isn't shaped as expected.
+    ``result`` list) or the payload isn't shaped as expected. Never raises:
+    fields of the wrong type are treated as missing.
     """
-    outer = _first(payload.get("result"))
+    outer = _first(_dict(payload).get("result"))
     design = _first(outer.get("result")) if outer else None
     if design is None:
         return None
 
-    name = str(design.get("name") or "Unknown Experience")
-    description = str(design.get("configDescription") or "")
-    likes = int(design.get("likes") or 0)
+    name = _str(design.get("name")) or "Unknown Experience"
+    description = _str(design.get("configDescription"))
+    likes = max(_int(design.get("likes")) or 0, 0)
 
-    play_design = design.get("playElementDesign") or {}
-    rotation = play_design.get("mapRotation") or {}
+    play_design = _dict(design.get("playElementDesign"))
+    rotation = _dict(play_design.get("mapRotation"))
 
     maps: list[str] = []
     image: str | None = None
     players: str | None = None
-    for entry in rotation.get("maps") or []:
+    for entry in _list(rotation.get("maps")):
         if not isinstance(entry, dict):
             continue
         map_name = _friendly_map_name(entry)
         if map_name:
             maps.append(map_name)
-        if image is None and entry.get("image"):
-            image = str(entry["image"])
+        if image is None:
+            image = _str(entry.get("image")) or None
         # Player count is consistent across a rotation; take the first we find.
         if players is None:
             players = _player_count(entry)
 
-    updated_raw = (play_design.get("updated") or {}).get("seconds")
-    updated = int(updated_raw) if updated_raw else None
+    updated = _int(_dict(play_design.get("updated")).get("seconds")) or None
 
     tags: list[str] = []
-    for tag in play_design.get("tags") or []:
-        translations = ((tag or {}).get("translation") or {}).get("translations") or []
-        # kind "6" is the human-readable tag title (e.g. "Custom Logic").
-        title = next(
-            (t.get("localizedText") for t in translations if t.get("kind") == "6"),
-            None,
+    for tag in _list(play_design.get("tags")):
+        translation = _dict(_dict(tag).get("translation"))
+        # kind "6" is the human-readable tag title (e.g. "Custom Logic"); stop at
+        # the first one rather than walking every other kind and language.
+        for entry in _list(translation.get("translations")):
+            entry = _dict(entry)
+            if entry.get("kind") == "6":
+                title = _str(entry.get("localizedText"))
+                if title:
+                    tags.append(title)
+                break
+
+    return Experience(
+        name, description, tuple(maps), tuple(tags), likes, image, players, updated
+    )
+
+
+def decode_payload(body: bytes) -> dict:
+    """Decode a response body, with orjson when it's installed."""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+async def open_session(
+    *, limit: int = 10, dns_ttl: int = 300, keepalive: float = 30
+) -> None:
+    """Open the shared HTTP session used by every experience lookup.
+
+    ``limit`` caps concurrent connections, ``dns_ttl`` is how long resolved
+    addresses are cached and ``keepalive`` how long idle connections are kept.
+    """
+    global _session
+    if _session is not None and not _session.closed:
+        return
+    connector = aiohttp.TCPConnector(
+        limit=limit, ttl_dns_cache=dns_ttl, keepalive_timeout=keepalive
+    )
+    _session = aiohttp.ClientSession(
+        connector=connector,
+        timeout=REQUEST_TIMEOUT,
+        trace_configs=[metrics.http_trace()],
+    )
+
+
+async def close_session() -> None:
+    """Close the shared HTTP session and its pooled connections."""
+    global _session
+    session, _session = _session, None
+    if session is not None:
+        await session.close()
+
+
+def configure_requests(
+    *,
+    api_url: str = API_URL,
+    rate: float = 5,
+    burst: int = 10,
+    max_attempts: int = 3,
+    failure_threshold: int = 5,
+    reset_timeout: float = 30,
+) -> None:
+    """Point lookups at ``api_url`` (e.g. a local stub server) and set the rate
+    limit (``rate`` requests/s, bursting to ``burst``), attempts per lookup and
+    the circuit breaker's failure threshold and cool-down in seconds."""
+    global _api_url, _limiter, _breaker, _max_attempts
+    _api_url = api_url
+    _limiter = TokenBucket(rate=rate, capacity=burst)
+    _breaker = CircuitBreaker(
+        failure_threshold, reset_timeout, name="gametools circuit"
+    )
+    _max_attempts = max(max_attempts, 1)
+
+
+def request_stats() -> dict[str, int | str]:
+    """Upstream requests, retries, rate-limit waits and circuit breaker state."""
+    return (
+        _request_counters
+        | {"rate_limited": _limiter.waits}
+        | {f"breaker_{k}": v for k, v in _breaker.stats().items()}
+    )
+
+
+def _get_session() -> aiohttp.ClientSession:
+    if _session is None or _session.closed:
+        raise RuntimeError("open_session() must be called before fetching experiences")
+    return _session
+
+
+class ExperienceUnavailable(Exception):
+    """The gametools API couldn't be reached, kept answering 429/5xx, or is
+    being skipped while the circuit breaker is open."""
+
+
+class _RetryableStatus(Exception):
+    def __init__(self, status: int, delay: float | None) -> None:
+        super().__init__(status)
+        self.status = status
+        self.delay = delay
+
+
+class PayloadTooLarge(ValueError):
+    """The response body exceeded :data:`MAX_PAYLOAD_BYTES`."""
+
+
+def normalize_code(code: str) -> str:
+    return code.strip().upper()
+
+
+async def _download(code: str) -> bytes | None:
+    """GET the raw response body for an already-normalized ``code``, or None if
+    the API answered with a client error (e.g. 404 for an unknown code).
+
+    Each attempt waits for the rate limiter; retryable failures (connection
+    errors, timeouts, 429 and 5xx) are retried up to the configured attempts
+    with jittered backoff, or after ``Retry-After`` when the server sends it.
+    Raises :class:`ExperienceUnavailable` once attempts run out, or straight
+    away while the circuit breaker is open, and :class:`PayloadTooLarge` as
+    soon as the body passes :data:`MAX_PAYLOAD_BYTES`.
+    """
+    if not _breaker.allow():
+        raise ExperienceUnavailable(f"{code}: circuit open")
+    try:
+        for attempt in range(_max_attempts):
+            if attempt:
+                _request_counters["retries"] += 1
+            await _limiter.acquire()
+            _request_counters["requests"] += 1
+            try:
+                body = await _request(code)
+            except _RetryableStatus as exc:
+                error: Exception = exc
+                delay = exc.delay
+            except (aiohttp.ClientError, TimeoutError) as exc:
+                error, delay = exc, None
+            else:
+                _breaker.record_success()
+                return body
+            if attempt + 1 < _max_attempts:
+                if delay is None:
+                    delay = backoff_delay(attempt)
+                log.info(
+                    "Experience lookup %r failed (%s); retrying in %.1fs",
+                    code,
+                    error,
+                    delay,
+                )
+                await asyncio.sleep(min(delay, MAX_RETRY_DELAY))
+    except PayloadTooLarge:
+        # The upstream answered; it just wasn't a usable answer.
+        _breaker.record_success()
+        raise
+    except BaseException:
+        _breaker.record_failure()
+        raise
+    _breaker.record_failure()
+    raise ExperienceUnavailable(code) from error
+
+
+async def _request(code: str) -> bytes | None:
+    """One GET attempt. Raises :class:`_RetryableStatus` for 429/5xx and returns
+    None for any other error status, which means there's no such experience."""
+    params = {"experiencecode": code, "lang": "en-us"}
+    async with _get_session().get(_api_url, params=params) as response:
+        if response.status in RETRYABLE_STATUSES:
+            raise _RetryableStatus(response.status, retry_after(response.headers))
+        if response.status >= 400:
+            log.info("Experience lookup %r: HTTP %s", code, response.status)
+            return None
+        if (response.content_length or 0) > MAX_PAYLOAD_BYTES:
+            raise PayloadTooLarge(response.content_length)
+        body = bytearray()
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            body += chunk
+            if len(body) > MAX_PAYLOAD_BYTES:
+                raise PayloadTooLarge(len(body))
+        return bytes(body)
+
+
+# --- Lookup cache -------------------------------------------------------------
+
+_cache: TTLCache[str, Experience | None] = TTLCache(512)
+_positive_ttl = 3600
+_negative_ttl = 300
+_max_persisted = 5000
+_cache_counters = {"memory_hits": 0, "db_hits": 0, "fetches": 0}
+_MISSING = object()
+
+
+def configure_cache(
+    *, size: int, ttl: int, negative_ttl: int, max_persisted: int
+) -> None:
+    """Size the in-memory cache and set how long found (``ttl``) and not-found
+    (``negative_ttl``) results are kept, in seconds. ``max_persisted`` bounds
+    the ``experience_cache`` table."""
+    global _cache, _positive_ttl, _negative_ttl, _max_persisted
+    _cache = TTLCache(size)
+    _positive_ttl, _negative_ttl, _max_persisted = ttl, negative_ttl, max_persisted
+
+
+def _experience_to_json(experience: Experience) -> str:
+    return json.dumps(asdict(experience))
+
+
+def _experience_from_json(payload: str) -> Experience:
+    fields = json.loads(payload)
+    fields["maps"] = tuple(fields["maps"])
+    fields["tags"] = tuple(fields["tags"])
+    return Experience(**fields)
+
+
+async def _load_persisted(code: str) -> Experience | None | object:
+    """Return the persisted cache result for ``code``, or :data:`_MISSING`."""
+    try:
+        row = await db.get_cached_experience(code)
+        if row is None:
+            return _MISSING
+        payload, expires_at = row
+        experience = _experience_from_json(payload) if payload is not None else None
+    except Exception:
+        log.warning("Failed to read cached experience %r", code, exc_info=True)
+        return _MISSING
+    _cache.put(code, experience, expires_at)
+    _cache_counters["db_hits"] += 1
+    return experience
+
+
+async def _store_cached(code: str, experience: Experience | None) -> None:
+    ttl = _positive_ttl if experience is not None else _negative_ttl
+    expires_at = int(time.time()) + ttl
+    _cache.put(code, experience, expires_at)
+    payload = _experience_to_json(experience) if experience is not None else None
+    try:
+        await db.set_cached_experience(
+            code, payload, expires_at, max_rows=_max_persisted
         )
-        if title:
-            tags.append(str(title))
+    except Exception:
+        log.warning("Failed to persist cached experience %r", code, exc_info=True)
+
+
+def experience_cache_stats() -> dict[str, float]:
+    """In-memory cache size/counters, persisted-cache hits, upstream fetches and
+    the overall hit rate."""
+    stats: dict[str, float] = _cache.stats() | _cache_counters
+    lookups = stats["memory_hits"] + stats["db_hits"] + stats["fetches"]
+    stats["hit_rate"] = (lookups - stats["fetches"]) / lookups if lookups else 0.0
+    return stats
+
 
-    return Experience(name, description, maps, tags, likes, image, players, updated)
+# --- Single-flight ------------------------------------------------------------
+
+# Normalized code -> the lookup currently running for it.
+_inflight: dict[str, asyncio.Task[Experience | None]] = {}
+_inflight_counters = {"leaders": 0, "coalesced": 0, "waiting": 0}
+
+
+def inflight_stats() -> dict[str, int]:
+    """Lookups in flight, how many started an upstream lookup ("leaders"), how
+    many joined one already running ("coalesced") and how many are waiting on
+    one right now."""
+    return {"inflight": len(_inflight)} | _inflight_counters
 
 
 async def fetch_experience(code: str) -> Experience | None:
-    """Fetch and parse experience details for ``code``.
+    """Fetch and parse experience details for ``code``, via the cache.
 
-    Returns ``None`` when the code is invalid or the lookup fails for any
-    reason; callers treat that as "nothing to show".
+    Returns ``None`` when the code is unknown or its payload can't be used;
+    those results are cached for the shorter negative TTL. Raises
+    :class:`ExperienceUnavailable` when the API can't be reached right now.
+    Concurrent callers for the same code share a single lookup.
     """
-    params = {"experiencecode": code.strip().upper(), "lang": "en-us"}
+    code = normalize_code(code)
+    cached = _cache.get(code, _MISSING)
+    if cached is not _MISSING:
+        _cache_counters["memory_hits"] += 1
+        return cached
+
+    task = _inflight.get(code)
+    if task is None:
+        _inflight_counters["leaders"] += 1
+        task = asyncio.create_task(_lookup(code), name=f"experience-{code}")
+        _inflight[code] = task
+        task.add_done_callback(lambda _: _inflight.pop(code, None))
+    else:
+        _inflight_counters["coalesced"] += 1
+    # Shielded so one caller being cancelled doesn't cancel the shared lookup.
+    _inflight_counters["waiting"] += 1
     try:
-        async with aiohttp.ClientSession(timeout=REQUEST_TIMEOUT) as session:
-            async with session.get(API_URL, params=params) as response:
-                response.raise_for_status()
-                payload = await response.json()
-    except (aiohttp.ClientError, TimeoutError):
-        log.warning("Failed to fetch experience for code %r", code, exc_info=True)
-        return None
+        return await asyncio.shield(task)
+    finally:
+        _inflight_counters["waiting"] -= 1
+
+
+async def _lookup(code: str) -> Experience | None:
+    """Resolve a cache miss: the persisted cache, then the API."""
+    cached = await _load_persisted(code)
+    if cached is not _MISSING:
+        return cached
+
+    _cache_counters["fetches"] += 1
+    try:
+        body = await _download(code)
+    except PayloadTooLarge as exc:
+        log.warning("Experience payload for code %r too large (%s bytes)", code, exc)
+        body = None
 
     try:
-        return parse_experience(payload)
+        experience = parse_experience(decode_payload(body)) if body else None
     except Exception:
         log.warning("Failed to parse experience for code %r", code, exc_info=True)
-        return None
+        experience = None
+    await _store_cached(code, experience)
+    return experience
 
 
-async def post_experience_embed(thread: discord.abc.Messageable, code: str) -> None:
+async def post_experience_embed(thread: discord.Thread, code: str) -> None:
     """Look up ``code`` and post its details (or a warning) into ``thread``.
 
     Intended to run as a fire-and-forget background task after the scheduling
     flow finishes, since the network call can be slow. Swallows all errors so a
-    failure here never surfaces as an unhandled task exception.
+    failure here never surfaces as an unhandled task exception. A posted embed
+    is recorded against the thread's playtest for later refreshes.
     """
     try:
-        experience = await fetch_experience(code)
+        try:
+            experience = await fetch_experience(code)
+        except ExperienceUnavailable as exc:
+            log.warning("Experience lookup for %r unavailable: %s", code, exc)
+            await thread.send(
+                "⚠️ Experience lookup is temporarily unavailable for code "
+                f"`{normalize_code(code)}`. Please try again later."
+            )
+            return
         if experience is not None:
-            await thread.send(embed=build_experience_embed(experience))
+            embed = build_experience_embed(experience)
+            message = await thread.send(embed=embed)
+            # A playtest thread shares its id with its announcement message.
+            await db.set_playtest_embed(thread.id, message.id, embed_hash(embed))
         else:
             log.info("No experience found for code %r", code)
             await thread.send(
-                f"⚠️ Couldn't find an experience for code `{code.strip().upper()}`."
+                f"⚠️ Couldn't find an experience for code `{normalize_code(code)}`."
             )
     except Exception:
         log.exception("Failed to post experience embed for code %r", code)
 
 
+async def refresh_experience_embed(
+    client: discord.Client, playtest: db.Playtest
+) -> bool:
+    """Re-render a playtest's experience embed and edit it if it changed.
+
+    Returns True when the message was edited. Lookups go through the cache, and
+    the message is only touched when the rendered embed's hash differs from the
+    stored one, so REST calls stay proportional to actual upstream changes.
+    Archived threads are skipped: editing in one would unarchive it (or fail
+    once it's locked). Active threads are always cached, so a thread that isn't
+    is archived or gone.
+    """
+    if not playtest.code or playtest.embed_message_id is None:
+        return False
+    thread = client.get_channel(playtest.message_id)
+    if not isinstance(thread, discord.Thread) or thread.archived:
+        return False
+    try:
+        experience = await fetch_experience(playtest.code)
+    except ExperienceUnavailable:
+        return False
+    if experience is None:
+        # Keep the last good embed rather than replacing it with nothing.
+        return False
+
+    embed = build_experience_embed(experience)
+    digest = embed_hash(embed)
+    if digest == playtest.embed_hash:
+        return False
+
+    message = thread.get_partial_message(playtest.embed_message_id)
+    try:
+        await message.edit(embed=embed)
+    except discord.NotFound:
+        log.info("Experience embed for playtest %s is gone", playtest.message_id)
+        await db.set_playtest_embed(playtest.message_id, None, None)
+        return False
+    except discord.HTTPException:
+        log.warning(
+            "Failed to refresh experience embed for playtest %s",
+            playtest.message_id,
+            exc_info=True,
+        )
+        return False
+    await db.set_playtest_embed(playtest.message_id, playtest.embed_message_id, digest)
+    return True
+
+
 # Show at most this many map names inline; the rest collapse into "+N more".
 MAX_MAPS_SHOWN = 8
 
+# Discord rejects embeds over its size limits, so long upstream text is clipped.
+# The description gets half its 4096 limit to keep the whole embed under the
+# 6000-character cap; other field values are short by construction.
+TITLE_LIMIT = 256
+DESCRIPTION_LIMIT = 2048
+FIELD_VALUE_LIMIT = 1024
+
+
+def _clip(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[: limit - 1] + "…"
+
 
-def _maps_value(maps: list[str]) -> str:
+def _maps_value(maps: Sequence[str]) -> str:
     """Comma-joined map list, capped with a "+N more" suffix for long rotations."""
     shown = maps[:MAX_MAPS_SHOWN]
     value = ", ".join(f"`{name}`" for name in shown)
     remaining = len(maps) - len(shown)
     if remaining > 0:
         value += f" … +{remaining} more"
-    return value
+    return _clip(value, FIELD_VALUE_LIMIT)
+
+
+def embed_hash(embed: discord.Embed) -> str:
+    """Stable digest of an embed's rendered content."""
+    rendered = json.dumps(embed.to_dict(), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha256(rendered.encode()).hexdigest()
 
 
 def build_experience_embed(experience: Experience) -> discord.Embed:
     """Render an experience as a Discord embed for the playtest thread."""
     embed = discord.Embed(
-        title=f"🎮 {experience.name}",
-        description=experience.description or None,
+        title=_clip(f"🎮 {experience.name}", TITLE_LIMIT),
+        description=_clip(experience.description, DESCRIPTION_LIMIT) or None,
         color=discord.Color.blurple(),
     )
     if experience.players:
@@ -232,7 +655,11 @@ def build_experience_embed(experience: Experience) -> discord.Embed:
             inline=False,
         )
     if experience.tags:
-        embed.add_field(name="Tags", value=", ".join(experience.tags), inline=False)
+        embed.add_field(
+            name="Tags",
+            value=_clip(", ".join(experience.tags), FIELD_VALUE_LIMIT),
+            inline=False,
+        )
     if experience.image:
         embed.set_image(url=experience.image)
     embed.set_footer(text="Experience details via gametools.network")
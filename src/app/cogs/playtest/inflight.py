@@ -0,0 +1,90 @@
+"""Guards against duplicate and concurrent playtest submissions.
+
+A double-clicked submit or a retried interaction would otherwise post a second
+announcement, thread and pin. New playtests are keyed by user: while one of a
+user's submissions is in flight any other is turned away, and a submission
+identical to the one they scheduled within the last :data:`DUPLICATE_WINDOW`
+seconds is treated as a repeat. Updates are keyed by announcement message id and
+serialized with :func:`updating`, so two people editing one playtest take turns
+instead of racing.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import hashlib
+import json
+import time
+from collections.abc import AsyncIterator
+
+DUPLICATE_WINDOW = 30.0
+
+# Why a new submission was turned away.
+BUSY = "busy"
+DUPLICATE = "duplicate"
+
+_scheduling: set[int] = set()
+# User id -> (fingerprint, monotonic time) of their last scheduled playtest.
+_recent: dict[int, tuple[str, float]] = {}
+# Message id -> (lock, number of holders and waiters).
+_update_locks: dict[int, tuple[asyncio.Lock, int]] = {}
+_counters = {"schedules": 0, "busy": 0, "duplicates": 0, "updates": 0, "waited": 0}
+
+
+def fingerprint(regions: list[str], description: str, code: str) -> str:
+    """Identify a submission by what it would post."""
+    rendered = json.dumps([sorted(regions), description, code], ensure_ascii=False)
+    return hashlib.sha256(rendered.encode()).hexdigest()
+
+
+def begin_schedule(user_id: int, fp: str) -> str | None:
+    """Claim the user's schedule slot. Returns :data:`BUSY` or :data:`DUPLICATE`
+    if the submission should be turned away, else None; then call
+    :func:`end_schedule` once it's done."""
+    if user_id in _scheduling:
+        _counters["busy"] += 1
+        return BUSY
+    now = time.monotonic()
+    for uid in [u for u, (_, at) in _recent.items() if now - at >= DUPLICATE_WINDOW]:
+        del _recent[uid]
+    if _recent.get(user_id, (None,))[0] == fp:
+        _counters["duplicates"] += 1
+        return DUPLICATE
+    _scheduling.add(user_id)
+    _counters["schedules"] += 1
+    return None
+
+
+def end_schedule(user_id: int, fp: str, *, posted: bool) -> None:
+    """Release the user's slot, remembering the submission if it was posted."""
+    _scheduling.discard(user_id)
+    if posted:
+        _recent[user_id] = (fp, time.monotonic())
+
+
+@contextlib.asynccontextmanager
+async def updating(message_id: int) -> AsyncIterator[None]:
+    """Hold the update lock for a playtest's announcement message."""
+    lock, users = _update_locks.get(message_id, (None, 0))
+    if lock is None:
+        lock = asyncio.Lock()
+    elif lock.locked():
+        _counters["waited"] += 1
+    _update_locks[message_id] = (lock, users + 1)
+    _counters["updates"] += 1
+    try:
+        async with lock:
+            yield
+    finally:
+        lock, users = _update_locks[message_id]
+        if users == 1:
+            del _update_locks[message_id]
+        else:
+            _update_locks[message_id] = (lock, users - 1)
+
+
+def inflight_stats() -> dict[str, int]:
+    """Schedules started, turned away (busy / duplicate) and updates (and how
+    many had to wait for another)."""
+    return _counters | {"scheduling": len(_scheduling)}
@@ -0,0 +1,56 @@
+"""Clean up the "pinned a message" notices in new playtest threads.
+
+Pinning the instructions message makes Discord post a ``pins_add`` system
+message in the thread. Rather than scanning the thread's history for it, the
+schedule flow registers the thread with :func:`expect_pin_notice` just before
+pinning, and the cog's ``on_message`` listener hands every ``pins_add`` message
+to :func:`delete_if_expected`, which deletes it as it arrives. Registrations
+expire after :data:`PIN_NOTICE_TTL` seconds so threads whose notice never shows
+up don't accumulate.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+
+import discord
+
+log = logging.getLogger(__name__)
+
+PIN_NOTICE_TTL = 120.0
+
+# Thread id -> monotonic deadline for its pin notice.
+_expected: dict[int, float] = {}
+
+
+def expect_pin_notice(thread_id: int) -> None:
+    """Delete the next pin notice posted in ``thread_id``. Call before pinning."""
+    _expected[thread_id] = time.monotonic() + PIN_NOTICE_TTL
+
+
+def _prune(now: float) -> None:
+    for thread_id in [t for t, deadline in _expected.items() if deadline <= now]:
+        del _expected[thread_id]
+
+
+async def delete_if_expected(message: discord.Message) -> bool:
+    """Delete ``message`` if it's the pin notice of a registered thread."""
+    if message.type is not discord.MessageType.pins_add:
+        return False
+    _prune(time.monotonic())
+    if _expected.pop(message.channel.id, None) is None:
+        return False
+    try:
+        await message.delete()
+    except discord.HTTPException:
+        log.warning(
+            "Failed to delete pin notification in thread %s", message.channel.id
+        )
+        return False
+    return True
+
+
+def pending() -> int:
+    """Threads still waiting for their pin notice."""
+    return len(_expected)
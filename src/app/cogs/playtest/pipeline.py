@@ -0,0 +1,115 @@
+"""A tiny dependency-aware runner for multi-step Discord flows.
+
+Each named stage is a coroutine function started as a task as soon as the
+stages it depends on have finished; it's called with their results, in order.
+Independent stages therefore run concurrently, and a caller can await just the
+stage it needs (e.g. to reply to the user) while the rest carry on::
+
+    pipeline = Pipeline("Schedule 1234", flow="schedule")
+    pipeline.stage("channel", get_channel)
+    pipeline.stage("message", post, after=("channel",))
+    message = await pipeline.wait("message")
+    ...
+    await pipeline.finish()  # wait for everything, log per-stage timings
+    executor.track(pipeline.finish_later())  # or do that without waiting
+
+A stage whose dependency failed fails with the same exception without running.
+Stage durations are also recorded in the ``ranger_stage_seconds`` histogram,
+labelled with the pipeline's ``flow``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections.abc import Awaitable, Callable, Iterable
+from typing import Any
+
+from ... import metrics
+
+log = logging.getLogger(__name__)
+
+
+class Pipeline:
+    # Tasks finishing pipelines in the background, kept referenced until done.
+    _unfinished: set[asyncio.Task[None]] = set()
+
+    def __init__(self, name: str, *, flow: str | None = None) -> None:
+        self.name = name
+        self.flow = flow or name
+        self._started = time.perf_counter()
+        self._tasks: dict[str, asyncio.Task[Any]] = {}
+        # Stage name -> (start offset, duration) in seconds, for stages that ran.
+        self.timings: dict[str, tuple[float, float]] = {}
+        # Stages whose own function raised (not those skipped after a failure).
+        self.errors: dict[str, Exception] = {}
+
+    def stage(
+        self,
+        name: str,
+        func: Callable[..., Awaitable[Any]],
+        *,
+        after: Iterable[str] = (),
+    ) -> None:
+        """Start ``func`` once every stage in ``after`` (already added) is done."""
+        deps = [self._tasks[dep] for dep in after]
+        self._tasks[name] = asyncio.create_task(self._run(name, func, deps))
+
+    async def _run(
+        self,
+        name: str,
+        func: Callable[..., Awaitable[Any]],
+        deps: list[asyncio.Task[Any]],
+    ) -> Any:
+        args = [await dep for dep in deps]
+        start = time.perf_counter()
+        try:
+            return await func(*args)
+        except Exception as exc:
+            self.errors[name] = exc
+            raise
+        finally:
+            end = time.perf_counter()
+            self.timings[name] = (start - self._started, end - start)
+            metrics.STAGE.observe(end - start, flow=self.flow, stage=name)
+
+    def succeeded(self, name: str) -> bool:
+        """Whether a stage has run to completion without raising."""
+        task = self._tasks.get(name)
+        return (
+            task is not None
+            and task.done()
+            and not task.cancelled()
+            and task.exception() is None
+        )
+
+    async def wait(self, name: str) -> Any:
+        """Wait for a stage and return its result (or raise its exception)."""
+        return await self._tasks[name]
+
+    async def finish(self) -> None:
+        """Wait for every stage, then log failures and per-stage timings."""
+        await asyncio.gather(*self._tasks.values(), return_exceptions=True)
+        self._report()
+
+    def finish_later(self) -> asyncio.Task[None]:
+        """:meth:`finish` in the background. Returns the task, which should be
+        tracked (see :meth:`TaskExecutor.track`) so shutdown waits for the
+        remaining stages; cancelling it cancels them."""
+        task = asyncio.create_task(self.finish(), name=f"finish {self.name}")
+        Pipeline._unfinished.add(task)
+        task.add_done_callback(Pipeline._unfinished.discard)
+        return task
+
+    def _report(self) -> None:
+        for name, exc in self.errors.items():
+            log.error("%s: stage %r failed", self.name, name, exc_info=exc)
+        total = time.perf_counter() - self._started
+        stages = ", ".join(
+            f"{name} {duration * 1000:.0f}ms @{offset * 1000:.0f}ms"
+            for name, (offset, duration) in sorted(
+                self.timings.items(), key=lambda item: item[1][0]
+            )
+        )
+        log.info("%s finished in %.0fms: %s", self.name, total * 1000, stages)
@@ -0,0 +1,149 @@
+"""Client-side protection for calls to the gametools API.
+
+- :class:`TokenBucket` caps our request rate so a burst of schedules can't
+  hammer the upstream.
+- :func:`backoff_delay` / :func:`retry_after` pick how long to wait before a
+  retry, honouring the server's ``Retry-After`` when it sends one.
+- :class:`CircuitBreaker` fails fast while the upstream looks down and lets a
+  single probe through once the cool-down has passed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import random
+import time
+from collections.abc import Callable, Mapping
+from email.utils import parsedate_to_datetime
+
+log = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Allow ``rate`` acquisitions per second on average, bursting to ``capacity``."""
+
+    def __init__(
+        self, rate: float, capacity: int, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.rate = rate
+        self.capacity = max(capacity, 1)
+        self._clock = clock
+        self._tokens = float(self.capacity)
+        self._updated = clock()
+        # Waiters queue up behind the lock so they're served in arrival order.
+        self._lock = asyncio.Lock()
+        self.waits = 0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        elapsed = now - self._updated
+        self._tokens = min(self.capacity, self._tokens + elapsed * self.rate)
+        self._updated = now
+
+    async def acquire(self) -> None:
+        """Wait until a token is available, then take it."""
+        async with self._lock:
+            self._refill()
+            if self._tokens < 1:
+                self.waits += 1
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= 1
+
+
+def backoff_delay(attempt: int, *, base: float = 0.5, cap: float = 8.0) -> float:
+    """Full-jitter exponential backoff for the given 0-based retry attempt."""
+    return random.uniform(0, min(cap, base * 2**attempt))
+
+
+def retry_after(headers: Mapping[str, str]) -> float | None:
+    """Seconds to wait according to a ``Retry-After`` header, if there is one.
+
+    Accepts both forms the header allows: delay-seconds and an HTTP date.
+    """
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class CircuitBreaker:
+    """Open after ``failure_threshold`` consecutive failures; after
+    ``reset_timeout`` seconds let one probe through ("half-open") and close again
+    if it succeeds."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int,
+        reset_timeout: float,
+        *,
+        name: str = "circuit",
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.failure_threshold = max(failure_threshold, 1)
+        self.reset_timeout = reset_timeout
+        self.name = name
+        self._clock = clock
+        self.state = self.CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+        self.rejections = 0
+        self.trips = 0
+
+    def allow(self) -> bool:
+        """Whether a request may go out now. Counts a rejection when not."""
+        if self.state == self.OPEN:
+            if self._clock() - self._opened_at < self.reset_timeout:
+                self.rejections += 1
+                return False
+            self.state = self.HALF_OPEN
+            log.info("%s half-open; probing upstream", self.name)
+        if self.state == self.HALF_OPEN:
+            if self._probing:
+                self.rejections += 1
+                return False
+            self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        if self.state != self.CLOSED:
+            log.info("%s closed; upstream recovered", self.name)
+        self.state = self.CLOSED
+        self._failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self.state == self.HALF_OPEN or self._failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.trips += 1
+                log.warning(
+                    "%s open after %d failures; failing fast for %ss",
+                    self.name,
+                    self._failures,
+                    self.reset_timeout,
+                )
+            self.state = self.OPEN
+            self._opened_at = self._clock()
+        self._probing = False
+
+    def stats(self) -> dict[str, int | str]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self._failures,
+            "trips": self.trips,
+            "rejections": self.rejections,
+        }
@@ -0,0 +1,116 @@
+"""Resolve and cache the Discord objects the playtest cog is configured with.
+
+The announcement channel, the menu channel and the region -> role map are looked
+up once and kept in memory, so a submit costs no REST call or repeated lookups.
+The cog drops cached entries on channel / role update and delete gateway events
+(see :func:`invalidate_channel` and :func:`invalidate_role`), and the next use
+resolves them again. :func:`report_missing_roles` runs at startup so a
+misconfigured region shows up in the logs rather than in a user's submit.
+"""
+
+from __future__ import annotations
+
+import logging
+
+import discord
+from discord import TextChannel
+
+from ...config import env, load_regions
+
+log = logging.getLogger(__name__)
+
+# Channel id -> resolved text channel.
+_channels: dict[int, TextChannel] = {}
+# Guild id -> region name -> role, for the regions whose role exists.
+_roles: dict[int, dict[str, discord.Role]] = {}
+
+
+def regions() -> dict[str, int]:
+    """The configured region -> role-id mapping, read from disk once (and
+    again after :func:`clear`)."""
+    return load_regions()
+
+
+async def _text_channel(
+    source: discord.Client | discord.Guild, channel_id: int
+) -> TextChannel | None:
+    channel = _channels.get(channel_id)
+    if channel is not None:
+        return channel
+    try:
+        channel = source.get_channel(channel_id) or await source.fetch_channel(
+            channel_id
+        )
+    except discord.HTTPException:
+        log.exception("Couldn't fetch channel %s", channel_id)
+        return None
+    if not isinstance(channel, TextChannel):
+        log.error("Channel %s is not a TextChannel", channel_id)
+        return None
+    _channels[channel_id] = channel
+    return channel
+
+
+async def get_announcement_channel(guild: discord.Guild | None) -> TextChannel | None:
+    if not guild:
+        return None
+    return await _text_channel(guild, env.PLAYTEST_COG_SETTINGS.ANNOUNCE_CHANNEL_ID)
+
+
+async def get_menu_channel(client: discord.Client) -> TextChannel | None:
+    return await _text_channel(client, env.PLAYTEST_COG_SETTINGS.MENU_CHANNEL_ID)
+
+
+def region_roles(guild: discord.Guild) -> dict[str, discord.Role]:
+    """Region name -> role for every configured region whose role exists."""
+    roles = _roles.get(guild.id)
+    if roles is None:
+        roles = {}
+        for name, role_id in regions().items():
+            role = guild.get_role(role_id)
+            if role is not None:
+                roles[name] = role
+        _roles[guild.id] = roles
+    return roles
+
+
+def resolve_roles(
+    guild: discord.Guild | None, selected: list[str]
+) -> tuple[list[discord.Role], list[str]]:
+    """Map selected region names to roles, collecting any that can't be found."""
+    roles = region_roles(guild) if guild else {}
+    found = [roles[name] for name in selected if name in roles]
+    missing = [name for name in selected if name not in roles]
+    return found, missing
+
+
+def report_missing_roles(guild: discord.Guild) -> list[str]:
+    """Log, and return, the configured regions whose role isn't in ``guild``."""
+    _roles.pop(guild.id, None)
+    roles = region_roles(guild)
+    missing = [name for name in regions() if name not in roles]
+    for name in missing:
+        log.warning(
+            "Region %r is mapped to role %s, which doesn't exist in %s",
+            name,
+            regions()[name],
+            guild.name,
+        )
+    return missing
+
+
+def invalidate_channel(channel_id: int) -> None:
+    if _channels.pop(channel_id, None) is not None:
+        log.info("Channel %s changed; will resolve it again", channel_id)
+
+
+def invalidate_role(role: discord.Role) -> None:
+    if role.id in regions().values() and _roles.pop(role.guild.id, None):
+        log.info("Region role %s changed; will resolve roles again", role.id)
+
+
+def clear() -> None:
+    """Forget everything, including the regions config."""
+    load_regions.cache_clear()
+    _channels.clear()
+    _roles.clear()
@@ -8,20 +8,21 @@ implement the "schedule" and "edit" submit flows respectively.
 from __future__ import annotations
 
 import asyncio
+import contextlib
 import logging
 
 import discord
 
-from .... import db
-from ....config import load_regions
+from .... import command_ids, db, metrics
+from .. import inflight, pins, resolver
 from ..announcements import (
     EXPERIENCE_CODE_MAX_LENGTH,
     description_char_budget,
-    get_announcement_channel,
     send_announcement,
     update_announcement,
 )
 from ..experience import post_experience_embed
+from ..pipeline import Pipeline
 
 log = logging.getLogger(__name__)
 
@@ -29,39 +30,6 @@ log = logging.getLogger(__name__)
 # Defined in the cog; kept as a literal here to avoid a circular import.
 UPDATE_COMMAND_NAME = "update-playtest"
 
-background_tasks: set[asyncio.Task] = set()
-
-def spawn_task(coro) -> None:
-    """Run a coroutine as a tracked fire-and-forget background task."""
-    task = asyncio.create_task(coro)
-    background_tasks.add(task)
-    task.add_done_callback(background_tasks.discard)
-
-
-async def _command_mention(interaction: discord.Interaction, name: str) -> str:
-    """Return a clickable command mention (``</name:id>``), or ``/name`` on failure."""
-    try:
-        commands = await interaction.client.tree.fetch_commands(guild=interaction.guild)
-    except discord.HTTPException:
-        log.warning("Couldn't fetch commands to mention %r", name)
-        return f"/{name}"
-    for command in commands:
-        if command.name == name:
-            return command.mention
-    return f"/{name}"
-
-
-async def _delete_pin_notification(thread: discord.Thread) -> None:
-    """Remove the "pinned a message" system message Discord posts when we pin."""
-    async for message in thread.history(limit=5):
-        if message.type is discord.MessageType.pins_add:
-            try:
-                await message.delete()
-            except discord.HTTPException:
-                log.warning("Failed to delete pin notification in thread %s", thread.id)
-            return
-
-
 class PlaytestModal(discord.ui.Modal):
     """Base modal capturing description, experience code and regions (in that order).
 
@@ -77,7 +45,6 @@ class PlaytestModal(discord.ui.Modal):
         selected_regions: list[str],
     ) -> None:
         super().__init__(title=self.modal_title)
-        self._regions = regions
 
         # Cap the description so the assembled announcement can't exceed
         # Discord's message limit once the header, code, regions and footer are
@@ -134,22 +101,6 @@ class PlaytestModal(discord.ui.Modal):
             )
         )
 
-    def _resolve_roles(
-        self, guild: discord.Guild | None, selected: list[str]
-    ) -> tuple[list[discord.Role], list[str]]:
-        """Map selected region keys to roles, collecting any that can't be found."""
-        roles: list[discord.Role] = []
-        missing: list[str] = []
-        for key in selected:
-            role_id = self._regions.get(key)
-            role = guild.get_role(role_id) if guild and role_id else None
-            if role is not None:
-                roles.append(role)
-            else:
-                missing.append(key)
-                log.warning("Region role missing for %r (id=%s)", key, role_id)
-        return roles, missing
-
     def _read_inputs(self) -> tuple[list[str], str, str]:
         """Pull the current selection, description and code off the modal."""
         return (
@@ -168,54 +119,138 @@ class NewPlaytestModal(PlaytestModal):
     modal_title = "Schedule a Playtest"
 
     async def on_submit(self, interaction: discord.Interaction) -> None:
+        with metrics.track_interaction("schedule-modal", interaction):
+            await self._submit(interaction)
+
+    async def _submit(self, interaction: discord.Interaction) -> None:
+        selected, description, code = self._read_inputs()
+        user = interaction.user
+
+        # Turn away a double submit or retried interaction before posting twice.
+        fp = inflight.fingerprint(selected, description, code)
+        rejected = inflight.begin_schedule(user.id, fp)
+        if rejected is not None:
+            await interaction.response.send_message(
+                "⏳ Your playtest is already being scheduled."
+                if rejected == inflight.BUSY
+                else "✅ This playtest was already scheduled.",
+                ephemeral=True,
+            )
+            return
+
+        pipeline = Pipeline(f"Schedule playtest {interaction.id}", flow="schedule")
+        try:
+            await self._schedule(interaction, pipeline, selected, description, code)
+        finally:
+            inflight.end_schedule(user.id, fp, posted=pipeline.succeeded("announce"))
+
+    async def _schedule(
+        self,
+        interaction: discord.Interaction,
+        pipeline: Pipeline,
+        selected: list[str],
+        description: str,
+        code: str,
+    ) -> None:
         # Posting the announcement, thread and pin takes longer than the 3s
         # interaction window, so acknowledge first and reply via followup.
         await interaction.response.defer(ephemeral=True)
+        metrics.acked(interaction)
 
-        selected, description, code = self._read_inputs()
-
-        await db.set_user_regions(interaction.user.id, selected)
+        roles, missing = resolver.resolve_roles(interaction.guild, selected)
+        user = interaction.user
+        # The interaction id is unique to this playtest and known before we post,
+        # so the announcement goes out once with its final header.
+        seed = interaction.id
+        thread_name = (
+            f"Playtest {code}" if code else f"Playtest by {user.display_name}"
+        )[:100]
 
-        roles, missing = self._resolve_roles(interaction.guild, selected)
+        async def announce(channel: discord.TextChannel):
+            return await send_announcement(
+                user.id, channel, roles, description, code, seed
+            )
 
-        channel = await get_announcement_channel(interaction.guild)
+        async def open_thread(announced) -> discord.Thread:
+            message, _ = announced
+            return await message.create_thread(name=thread_name)
 
-        if channel is None:
+        async def reply(thread: discord.Thread) -> None:
+            note = (
+                f"\n⚠️ Couldn't find role(s) for: {', '.join(missing)}"
+                if missing
+                else ""
+            )
             await interaction.followup.send(
-                "Couldn't find the announcement channel. Please contact an admin.",
+                f"✅ Playtest Scheduled, Thread: {thread.mention}!{note}",
                 ephemeral=True,
             )
-            return
 
-        message = await send_announcement(
-            interaction.user.id, channel, roles, description, code
-        )
-        thread_name = (
-            f"Playtest {code}"
-            if code
-            else f"Playtest by {interaction.user.display_name}"
-        )[:100]
-        thread: discord.Thread = await message.create_thread(name=thread_name)
-        mention = await _command_mention(interaction, UPDATE_COMMAND_NAME)
-        first_message = await thread.send(f"Use {mention} to update the playtest.")
-        await first_message.pin()
-        await _delete_pin_notification(thread)
-        note = f"\n⚠️ Couldn't find role(s) for: {', '.join(missing)}" if missing else ""
-        await interaction.followup.send(
-            f"✅ Playtest Scheduled, Thread: {thread.mention}!{note}", ephemeral=True
-        )
-        await db.set_playtest(
-            user_id=interaction.user.id,
-            message_id=thread.id,
-            regions=selected,
-            description=description,
-            code=code,
-        )
+        async def record(announced, thread: discord.Thread) -> None:
+            _, announcement_hash = announced
+            await db.set_playtest(
+                user_id=user.id,
+                message_id=thread.id,
+                regions=selected,
+                description=description,
+                code=code,
+                header_seed=seed,
+                announcement_hash=announcement_hash,
+            )
 
-        # The experience lookup hits the network and can be slow, so run it after
-        # the scheduling flow has fully finished rather than blocking on_submit.
-        if code:
-            spawn_task(post_experience_embed(thread, code))
+        async def pin_instructions(thread: discord.Thread) -> None:
+            mention = command_ids.mention(UPDATE_COMMAND_NAME)
+            first_message = await thread.send(f"Use {mention} to update the playtest.")
+            # The cog deletes the "pinned a message" notice when it arrives.
+            pins.expect_pin_notice(thread.id)
+            await first_message.pin()
+
+        # Stages start as soon as what they depend on is done:
+        #
+        #   regions
+        #   channel -> announce -> thread -> reply
+        #                               |-> record -> experience
+        #                               '-> pin
+        pipeline.stage("regions", lambda: db.set_user_regions(user.id, selected))
+        pipeline.stage(
+            "channel", lambda: resolver.get_announcement_channel(interaction.guild)
+        )
+        try:
+            if await pipeline.wait("channel") is None:
+                await interaction.followup.send(
+                    "Couldn't find the announcement channel. Please contact an admin.",
+                    ephemeral=True,
+                )
+                return
+            pipeline.stage("announce", announce, after=("channel",))
+            pipeline.stage("thread", open_thread, after=("announce",))
+            pipeline.stage("reply", reply, after=("thread",))
+            pipeline.stage("record", record, after=("announce", "thread"))
+            pipeline.stage("pin", pin_instructions, after=("thread",))
+            if code:
+                # The lookup can be slow, so it runs on the bot's bounded
+                # executor, one job at a time per thread. The embed is saved
+                # against the playtest row, so queue it once that exists.
+                pipeline.stage(
+                    "experience",
+                    lambda thread, _: interaction.client.executor.submit(
+                        post_experience_embed(thread, code),
+                        key=thread.id,
+                        name=f"experience embed {thread.id}",
+                    ),
+                    after=("thread", "record"),
+                )
+            # The user hears back as soon as the thread exists; everything else
+            # finishes in the background, which shutdown waits for.
+            await pipeline.wait("reply")
+        except Exception:
+            with contextlib.suppress(discord.HTTPException):
+                await interaction.followup.send(
+                    "Something went wrong scheduling the playtest. Please try again.",
+                    ephemeral=True,
+                )
+        finally:
+            interaction.client.executor.track(pipeline.finish_later())
 
 
 class UpdatePlaytestModal(PlaytestModal):
@@ -231,12 +266,14 @@ class UpdatePlaytestModal(PlaytestModal):
         scheduler_id: int,
         description: str,
         code: str,
+        header_seed: int,
     ) -> None:
         super().__init__(regions, selected_regions)
         self.description_input.default = description
         self.code_input.default = code
         self._message = message
         self._scheduler_id = scheduler_id
+        self._header_seed = header_seed
 
     @classmethod
     def from_playtest(
@@ -245,33 +282,61 @@ class UpdatePlaytestModal(PlaytestModal):
         """Build the modal pre-filled from an already-fetched playtest record and
         its announcement message."""
         return cls(
-            regions=load_regions(),
+            regions=resolver.regions(),
             selected_regions=playtest.regions,
             message=message,
-            scheduler_id=int(playtest.user_id),
+            scheduler_id=playtest.user_id,
             description=playtest.description,
             code=playtest.code,
+            header_seed=(
+                playtest.message_id
+                if playtest.header_seed is None
+                else playtest.header_seed
+            ),
         )
 
     async def on_submit(self, interaction: discord.Interaction) -> None:
+        with metrics.track_interaction("update-modal", interaction):
+            await self._submit(interaction)
+
+    async def _submit(self, interaction: discord.Interaction) -> None:
+        # Let shutdown wait for the edit and database write below.
+        interaction.client.executor.track(asyncio.current_task())
         # Editing the announcement can exceed the 3s interaction window, so
         # acknowledge first and reply via followup.
         await interaction.response.defer(ephemeral=True)
+        metrics.acked(interaction)
 
         selected, description, code = self._read_inputs()
 
-        roles, missing = self._resolve_roles(interaction.guild, selected)
-
-        await update_announcement(
-            self._scheduler_id, self._message, roles, description, code
-        )
-        await db.set_playtest(
-            user_id=self._scheduler_id,
-            message_id=self._message.id,
-            regions=selected,
-            description=description,
-            code=code,
-        )
+        roles, missing = resolver.resolve_roles(interaction.guild, selected)
+
+        # One update of a playtest at a time, so concurrent editors don't
+        # interleave their announcement edit and database write.
+        async with inflight.updating(self._message.id):
+            # Read the hash now rather than when the modal opened, in case
+            # another update landed in between.
+            playtest = await db.get_playtest(self._message.id)
+            with metrics.STAGE.time(flow="update", stage="announce"):
+                announcement_hash = await update_announcement(
+                    self._scheduler_id,
+                    self._message,
+                    roles,
+                    description,
+                    code,
+                    self._header_seed,
+                    previous_hash=playtest.announcement_hash if playtest else None,
+                )
+            with metrics.STAGE.time(flow="update", stage="record"):
+                await db.set_playtest(
+                    user_id=self._scheduler_id,
+                    message_id=self._message.id,
+                    regions=selected,
+                    description=description,
+                    code=code,
+                    header_seed=self._header_seed,
+                    announcement_hash=announcement_hash,
+                )
         note = f"\n⚠️ Couldn't find role(s) for: {', '.join(missing)}" if missing else ""
         await interaction.followup.send(
             f"✅ Playtest updated!{note}", ephemeral=True
@@ -280,4 +345,4 @@ class UpdatePlaytestModal(PlaytestModal):
 
 def build_playtest_modal(saved: list[str]) -> NewPlaytestModal:
     """Build the new-playtest modal with regions pre-filled from saved prefs."""
-    return NewPlaytestModal(load_regions(), saved)
+    return NewPlaytestModal(resolver.regions(), saved)
@@ -4,7 +4,7 @@ from __future__ import annotations
 
 import discord
 
-from .... import db
+from .... import db, metrics
 from .modals import build_playtest_modal
 
 MENU_BUTTON_CUSTOM_ID = "playtest:schedule"
@@ -25,5 +25,7 @@ class PlaytestMenuView(discord.ui.View):
     async def schedule(
         self, interaction: discord.Interaction, button: discord.ui.Button
     ) -> None:
-        saved = await db.get_user_regions(interaction.user.id)
-        await interaction.response.send_modal(build_playtest_modal(saved))
+        with metrics.track_interaction("menu-schedule", interaction):
+            saved = await db.get_user_regions(interaction.user.id)
+            await interaction.response.send_modal(build_playtest_modal(saved))
+            metrics.acked(interaction)
@@ -0,0 +1,98 @@
+"""Registry of synced application command ids.
+
+Clickable command mentions (``</name:id>``) need the command's id, which Discord
+assigns on sync. :func:`sync` records the ids from the result of ``tree.sync``
+and persists them in ``bot_state``; they're loaded back at startup, so
+:func:`mention` never has to fetch the command tree.
+
+Syncing is a rate-limited bulk overwrite, so :func:`sync` only does it when the
+serialized command tree differs from the one last synced (its hash is kept in
+``bot_state`` too) or when forced.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import time
+from collections.abc import Iterable
+
+import discord
+from discord import app_commands
+
+from . import db
+
+log = logging.getLogger(__name__)
+
+STATE_KEY = "command_ids"
+TREE_HASH_STATE_KEY = "command_tree_hash"
+
+# Command name -> id.
+_ids: dict[str, int] = {}
+
+
+async def load() -> None:
+    """Load the ids persisted by the last :func:`store`."""
+    stored = await db.get_state(STATE_KEY)
+    if not stored:
+        return
+    try:
+        _ids.update({str(k): int(v) for k, v in json.loads(stored).items()})
+    except (ValueError, AttributeError):
+        log.warning("Ignoring malformed stored command ids")
+
+
+async def store(commands: Iterable[app_commands.AppCommand]) -> None:
+    """Replace the registry with the commands returned by a sync, and persist it."""
+    _ids.clear()
+    _ids.update({command.name: command.id for command in commands})
+    await db.set_state(STATE_KEY, json.dumps(_ids))
+
+
+def tree_hash(
+    tree: app_commands.CommandTree, guild: discord.abc.Snowflake
+) -> str:
+    """Hash the payload ``tree.sync(guild=guild)`` would send."""
+    payload = {
+        "application_id": tree.client.application_id,
+        "guild_id": guild.id,
+        "commands": sorted(
+            (command.to_dict(tree) for command in tree.get_commands(guild=guild)),
+            key=lambda command: (command.get("type", 1), command["name"]),
+        ),
+    }
+    rendered = json.dumps(payload, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(rendered.encode()).hexdigest()
+
+
+async def sync(
+    tree: app_commands.CommandTree,
+    guild: discord.abc.Snowflake,
+    *,
+    force: bool = False,
+) -> bool:
+    """Sync ``tree`` to ``guild`` unless it's unchanged since the last sync and
+    the ids from then are still known. Returns whether it synced."""
+    digest = tree_hash(tree, guild)
+    if not force and _ids and await db.get_state(TREE_HASH_STATE_KEY) == digest:
+        log.info("Application commands unchanged; skipping sync to guild %s", guild.id)
+        return False
+    start = time.perf_counter()
+    synced = await tree.sync(guild=guild)
+    await store(synced)
+    await db.set_state(TREE_HASH_STATE_KEY, digest)
+    log.info(
+        "Synced %d application command(s) to guild %s in %.0fms",
+        len(synced),
+        guild.id,
+        (time.perf_counter() - start) * 1000,
+    )
+    return True
+
+
+def mention(name: str) -> str:
+    """A clickable mention of command ``name``, or plain ``/name`` if its id
+    isn't known."""
+    command_id = _ids.get(name)
+    return f"</{name}:{command_id}>" if command_id else f"/{name}"
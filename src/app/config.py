@@ -22,6 +22,8 @@ from pathlib import Path
 from pydantic import BaseModel, Field, SecretStr
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+from . import startup
+
 
 load_dotenv()
 
@@ -32,6 +34,33 @@ class BotSettings(BaseModel):
     DISCORD_TOKEN: SecretStr
     GUILD_ID: int = Field()
     DB_PATH: str = Field(default="ranger.db")
+    # Pooled SQLite connections: one writer plus this many read-only readers.
+    DB_READ_POOL_SIZE: int = Field(default=4, ge=1)
+    DB_CACHE_SIZE_KIB: int = Field(default=8192)
+    DB_MMAP_SIZE: int = Field(default=64 * 1024 * 1024)
+    # Queue region/playtest writes and commit them in batches (opt-in).
+    DB_WRITE_BEHIND: bool = Field(default=False)
+    DB_FLUSH_INTERVAL: float = Field(default=0.5, gt=0)
+    DB_FLUSH_BATCH_SIZE: int = Field(default=100, ge=1)
+    # In-memory LRU of users' saved region selections (0 disables it).
+    DB_REGION_CACHE_SIZE: int = Field(default=1024, ge=0)
+    DB_REGION_CACHE_WARM: bool = Field(default=True)
+    # Delete playtests older than this many days (unset keeps them forever),
+    # appending them to DB_ARCHIVE_PATH as JSON lines when that is set.
+    DB_RETENTION_DAYS: float | None = Field(default=None, gt=0)
+    DB_ARCHIVE_PATH: str | None = Field(default=None)
+    DB_RETENTION_BATCH_SIZE: int = Field(default=100, ge=1)
+    # Background work (e.g. posting experience embeds): concurrent workers, queue
+    # bound, and how long shutdown waits for queued work to finish.
+    EXECUTOR_WORKERS: int = Field(default=4, ge=1)
+    EXECUTOR_QUEUE_SIZE: int = Field(default=100, ge=1)
+    EXECUTOR_DRAIN_TIMEOUT: float = Field(default=10, ge=0)
+    # Serve Prometheus-format metrics on http://METRICS_HOST:METRICS_PORT/metrics
+    # (unset disables the endpoint; metrics are still collected).
+    METRICS_HOST: str = Field(default="127.0.0.1")
+    METRICS_PORT: int | None = Field(default=None, ge=1, le=65535)
+    # Sync application commands on startup even if they haven't changed.
+    FORCE_COMMAND_SYNC: bool = Field(default=False)
     LOG_LEVEL: str = Field(default="INFO")
     DEBUG: bool = Field(default=False)
 
@@ -48,6 +77,31 @@ class PlaytestCogSettings(BaseModel):
     REGIONS_CONFIG_DIR: str = "config"
     # Role ids allowed to update a playtest (moderators/admins).
     MOD_ROLE_IDS: list[int] = Field(default_factory=list)
+    # Shared HTTP session for gametools experience lookups.
+    EXPERIENCE_HTTP_LIMIT: int = Field(default=10, ge=1)
+    EXPERIENCE_DNS_TTL: int = Field(default=300, ge=0)
+    EXPERIENCE_KEEPALIVE: float = Field(default=30, ge=0)
+    # Experience lookup cache: entries kept in memory, seconds to keep found and
+    # not-found results, and rows kept in the persisted cache table.
+    EXPERIENCE_CACHE_SIZE: int = Field(default=512, ge=0)
+    EXPERIENCE_CACHE_TTL: int = Field(default=3600, ge=0)
+    EXPERIENCE_NEGATIVE_TTL: int = Field(default=300, ge=0)
+    EXPERIENCE_CACHE_MAX_ROWS: int = Field(default=5000, ge=1)
+    # Upstream endpoint (override to point at a local stub), request rate limit,
+    # attempts per lookup and circuit breaker threshold / cool-down (seconds).
+    EXPERIENCE_API_URL: str = "https://api.gametools.network/bf6/shared_playground/"
+    EXPERIENCE_RATE_LIMIT: float = Field(default=5, gt=0)
+    EXPERIENCE_RATE_BURST: int = Field(default=10, ge=1)
+    EXPERIENCE_MAX_ATTEMPTS: int = Field(default=3, ge=1)
+    EXPERIENCE_BREAKER_THRESHOLD: int = Field(default=5, ge=1)
+    EXPERIENCE_BREAKER_RESET: float = Field(default=30, gt=0)
+    # Re-render experience embeds in playtests updated within the window every
+    # this many minutes (0 disables), editing at most this many at once. The
+    # window matches Discord's default one-day thread auto-archive, since
+    # archived threads are left alone; raise it with the channel's setting.
+    EXPERIENCE_REFRESH_INTERVAL: float = Field(default=30, ge=0)
+    EXPERIENCE_REFRESH_WINDOW_DAYS: float = Field(default=1, gt=0)
+    EXPERIENCE_REFRESH_CONCURRENCY: int = Field(default=4, ge=1)
 
 
 class Settings(BaseSettings):
@@ -58,7 +112,8 @@ class Settings(BaseSettings):
 
 
 # Global singleton imported across the project.
-env = Settings()
+with startup.stage("settings"):
+    env = Settings()
 
 
 @lru_cache(maxsize=1)
@@ -5,82 +5,417 @@ Holds:
   pre-fill it next time.
 - ``playtests``: the details of each scheduled playtest, keyed to its announcement
   message so it can be looked up and edited later.
+- ``playtest_regions``: one row per region a playtest pinged, kept in step with
+  ``playtests`` by :func:`set_playtest` for region queries.
 - ``bot_state``: small key/value state, currently the posted menu message id so we
   edit it on restart instead of posting a duplicate.
+- ``experience_cache``: recent gametools experience lookups, so the lookup cache
+  survives a restart.
 
-The database path is taken from :data:`app.config.env` and a module-level path is
-cached by :func:`init_db`, so the accessor helpers can be called without passing
-it around.
+The database path is taken from :data:`app.config.env` and opened once by
+:func:`init_db`, which keeps a long-lived connection pool at module level so the
+accessor helpers can be called without passing it around: a single writer
+connection (writes are serialised behind a lock) and a small pool of read-only
+reader connections. The file is opened in WAL mode so readers never block on the
+writer. :func:`close_db` closes the pool on shutdown.
+
+The schema is versioned with ``PRAGMA user_version``; :func:`init_db` applies any
+pending migrations from :data:`_MIGRATIONS` so existing database files are
+upgraded in place.
+
+Region and playtest writes can optionally be queued and committed in batches
+("write-behind"), keeping commit latency out of the interaction path; see
+:func:`flush`.
 """
 
 from __future__ import annotations
 
+import argparse
+import asyncio
+import csv
 import json
-from dataclasses import dataclass
+import logging
+import sys
+import time
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from dataclasses import asdict, dataclass, fields
+from typing import TextIO
 
 import aiosqlite
 
-_db_path: str | None = None
-
-
-_SCHEMA = """
-CREATE TABLE IF NOT EXISTS user_regions (
-    user_id INTEGER PRIMARY KEY,
-    regions TEXT NOT NULL
-);
-CREATE TABLE IF NOT EXISTS playtests (
-    id INTEGER PRIMARY KEY,
-    user_id TEXT NOT NULL,
-    message_id TEXT NOT NULL UNIQUE,
-    regions TEXT NOT NULL,
-    description TEXT NOT NULL,
-    code TEXT NOT NULL
-);
-CREATE TABLE IF NOT EXISTS bot_state (
-    key   TEXT PRIMARY KEY,
-    value TEXT NOT NULL
-);
-"""
+from .cache import LRUCache
+from .metrics import DB as _DB_SECONDS
+
+log = logging.getLogger(__name__)
+
+# How long a connection waits on a locked database before raising.
+BUSY_TIMEOUT_MS = 5000
+
+_writer: aiosqlite.Connection | None = None
+_readers: asyncio.Queue[aiosqlite.Connection] | None = None
+_reader_conns: list[aiosqlite.Connection] = []
+_write_lock = asyncio.Lock()
+
+# Read-through cache in front of ``user_regions``; every menu click reads it
+# inside the interaction window. Sized by ``init_db``.
+_region_cache: LRUCache[int, list[str]] = LRUCache(0)
+
+
+# Schema migrations, applied in order. ``PRAGMA user_version`` records how many
+# have run, so existing databases are upgraded in place on startup. Never edit a
+# shipped migration; append a new one instead.
+_NOW = "CAST(strftime('%s', 'now') AS INTEGER)"
+
+_MIGRATIONS: tuple[str, ...] = (
+    # 1: the original, unversioned schema.
+    """
+    CREATE TABLE IF NOT EXISTS user_regions (
+        user_id INTEGER PRIMARY KEY,
+        regions TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS playtests (
+        id INTEGER PRIMARY KEY,
+        user_id TEXT NOT NULL,
+        message_id TEXT NOT NULL UNIQUE,
+        regions TEXT NOT NULL,
+        description TEXT NOT NULL,
+        code TEXT NOT NULL
+    );
+    CREATE TABLE IF NOT EXISTS bot_state (
+        key   TEXT PRIMARY KEY,
+        value TEXT NOT NULL
+    );
+    """,
+    # 2: snowflakes as INTEGER, created/updated timestamps (epoch seconds) and
+    # indexes for per-scheduler and time-range lookups. Existing playtests get
+    # their creation time from the announcement message's snowflake.
+    f"""
+    CREATE TABLE playtests_v2 (
+        id INTEGER PRIMARY KEY,
+        user_id INTEGER NOT NULL,
+        message_id INTEGER NOT NULL UNIQUE,
+        regions TEXT NOT NULL,
+        description TEXT NOT NULL,
+        code TEXT NOT NULL,
+        created_at INTEGER NOT NULL DEFAULT ({_NOW}),
+        updated_at INTEGER NOT NULL DEFAULT ({_NOW})
+    );
+    INSERT INTO playtests_v2
+        (id, user_id, message_id, regions, description, code, created_at, updated_at)
+    SELECT
+        id,
+        CAST(user_id AS INTEGER),
+        CAST(message_id AS INTEGER),
+        regions,
+        description,
+        code,
+        ((CAST(message_id AS INTEGER) >> 22) + 1420070400000) / 1000,
+        {_NOW}
+    FROM playtests;
+    DROP TABLE playtests;
+    ALTER TABLE playtests_v2 RENAME TO playtests;
+    CREATE INDEX idx_playtests_user_created ON playtests (user_id, created_at);
+    CREATE INDEX idx_playtests_created ON playtests (created_at);
+
+    ALTER TABLE user_regions ADD COLUMN updated_at INTEGER NOT NULL DEFAULT 0;
+    UPDATE user_regions SET updated_at = {_NOW};
+    CREATE INDEX idx_user_regions_updated ON user_regions (updated_at);
+    """,
+    # 3: playtest <-> region rows, so region queries are answered by SQL rather
+    # than decoding every playtest's JSON ``regions``. Backfilled from the JSON.
+    """
+    CREATE TABLE playtest_regions (
+        playtest_id INTEGER NOT NULL REFERENCES playtests (id) ON DELETE CASCADE,
+        region TEXT NOT NULL,
+        PRIMARY KEY (playtest_id, region)
+    ) WITHOUT ROWID;
+    CREATE INDEX idx_playtest_regions_region ON playtest_regions (region, playtest_id);
+    INSERT OR IGNORE INTO playtest_regions (playtest_id, region)
+    SELECT p.id, r.value
+    FROM playtests AS p, json_each(p.regions) AS r
+    WHERE json_valid(p.regions);
+    """,
+    # 4: persisted experience lookups so a restart doesn't start with a cold
+    # cache. A NULL payload records a code the API didn't know (negative entry).
+    """
+    CREATE TABLE experience_cache (
+        code TEXT PRIMARY KEY,
+        payload TEXT,
+        expires_at INTEGER NOT NULL
+    ) WITHOUT ROWID;
+    CREATE INDEX idx_experience_cache_expires ON experience_cache (expires_at);
+    """,
+    # 5: the experience embed posted in each playtest's thread and a hash of
+    # what it rendered, so a refresher can edit it only when it changed.
+    """
+    ALTER TABLE playtests ADD COLUMN embed_message_id INTEGER;
+    ALTER TABLE playtests ADD COLUMN embed_hash TEXT;
+    CREATE INDEX idx_playtests_updated ON playtests (updated_at);
+    """,
+    # 6: the seed picking each announcement's header. New announcements are
+    # seeded before they're posted; older ones were seeded on their message id,
+    # so backfill that to keep their headers unchanged.
+    """
+    ALTER TABLE playtests ADD COLUMN header_seed INTEGER;
+    UPDATE playtests SET header_seed = message_id;
+    """,
+    # 7: a hash of each announcement's rendered content, so edits that wouldn't
+    # change it can be skipped.
+    """
+    ALTER TABLE playtests ADD COLUMN announcement_hash TEXT;
+    """,
+)
+
+
+async def _migrate(conn: aiosqlite.Connection) -> None:
+    """Bring the schema up to date, one transaction per migration."""
+    async with conn.execute("PRAGMA user_version") as cur:
+        (version,) = await cur.fetchone()
+    if version > len(_MIGRATIONS):
+        raise RuntimeError(
+            f"Database schema version {version} is newer than this bot "
+            f"understands ({len(_MIGRATIONS)})"
+        )
+    for target in range(version + 1, len(_MIGRATIONS) + 1):
+        log.info("Migrating database schema to version %d", target)
+        try:
+            await conn.executescript(
+                f"BEGIN;\n{_MIGRATIONS[target - 1]}\n"
+                f"PRAGMA user_version = {target};\nCOMMIT;"
+            )
+        except BaseException:
+            await conn.rollback()
+            raise
+
+
+def _now() -> int:
+    return int(time.time())
+
+
+async def _connect(
+    path: str, *, cache_size_kib: int, mmap_size: int, read_only: bool = False
+) -> aiosqlite.Connection:
+    """Open a connection with the per-connection pragmas applied."""
+    conn = await aiosqlite.connect(path)
+    await conn.execute(f"PRAGMA busy_timeout = {BUSY_TIMEOUT_MS}")
+    # NORMAL is durable in WAL mode except for the last transactions on power loss.
+    await conn.execute("PRAGMA synchronous = NORMAL")
+    # A negative cache_size is in KiB rather than pages.
+    await conn.execute(f"PRAGMA cache_size = {-cache_size_kib}")
+    await conn.execute(f"PRAGMA mmap_size = {mmap_size}")
+    await conn.execute("PRAGMA temp_store = MEMORY")
+    await conn.execute("PRAGMA foreign_keys = ON")
+    if read_only:
+        await conn.execute("PRAGMA query_only = ON")
+    return conn
 
 
-async def init_db(path: str) -> None:
-    """Create tables if needed and remember the database path."""
-    global _db_path
-    _db_path = path
-    async with aiosqlite.connect(path) as conn:
-        await conn.executescript(_SCHEMA)
-        await conn.commit()
+async def init_db(
+    path: str,
+    *,
+    read_pool_size: int = 4,
+    cache_size_kib: int = 8192,
+    mmap_size: int = 64 * 1024 * 1024,
+    write_behind: bool = False,
+    flush_interval: float = 0.5,
+    flush_batch_size: int = 100,
+    region_cache_size: int = 1024,
+    warm_region_cache: bool = False,
+) -> None:
+    """Open the connection pool, switch to WAL and create tables if needed.
+
+    ``path`` must be a file: every reader opens its own connection, so an
+    in-memory database would give each of them a separate, empty database.
+
+    With ``write_behind`` the region and playtest upserts are queued and
+    committed in batches by a background flusher (see :func:`flush`).
+
+    Saved region selections are cached in an LRU of ``region_cache_size``
+    entries; ``warm_region_cache`` pre-loads it from the table.
+    """
+    global _writer, _readers, _flusher, _flusher_running, _region_cache
+    global _flush_interval, _flush_batch_size
+    if _writer is not None:
+        raise RuntimeError("init_db() has already been called")
+
+    writer = await _connect(path, cache_size_kib=cache_size_kib, mmap_size=mmap_size)
+    try:
+        # WAL is persistent on the file, so only the writer needs to set it.
+        async with writer.execute("PRAGMA journal_mode = WAL") as cur:
+            (mode,) = await cur.fetchone()
+        if mode.lower() != "wal":
+            log.warning("SQLite refused WAL mode for %s (using %s)", path, mode)
+        await _migrate(writer)
+
+        readers: asyncio.Queue[aiosqlite.Connection] = asyncio.Queue()
+        for _ in range(max(read_pool_size, 1)):
+            reader = await _connect(
+                path, cache_size_kib=cache_size_kib, mmap_size=mmap_size, read_only=True
+            )
+            _reader_conns.append(reader)
+            readers.put_nowait(reader)
+    except BaseException:
+        for conn in (*_reader_conns, writer):
+            await conn.close()
+        _reader_conns.clear()
+        raise
+
+    _writer, _readers = writer, readers
+    log.info(
+        "Opened database %s (1 writer, %d readers)", path, len(_reader_conns)
+    )
+
+    _region_cache = LRUCache(region_cache_size)
+    if warm_region_cache:
+        await _warm_region_cache()
+
+    if write_behind:
+        _flush_interval, _flush_batch_size = flush_interval, max(flush_batch_size, 1)
+        _flusher_running = True
+        _flusher = asyncio.create_task(_flush_loop(), name="db-write-behind")
+        log.info(
+            "Write-behind enabled (every %ss or %d writes)",
+            _flush_interval,
+            _flush_batch_size,
+        )
+
+
+async def close_db() -> None:
+    """Flush any queued writes and close every pooled connection.
 
+    Safe to call if the pool was never opened.
+    """
+    global _writer, _readers, _flusher, _flusher_running
+    if _flusher is not None:
+        # Let the flusher finish its current batch rather than cancelling it
+        # mid-transaction, then drain whatever is still queued.
+        _flusher_running = False
+        _flush_wakeup.set()
+        await _flusher
+        _flusher = None
+        try:
+            await flush()
+        except Exception:
+            log.exception(
+                "Dropping %d queued writes on shutdown",
+                len(_pending_regions) + len(_pending_playtests),
+            )
+    writer, _writer, _readers = _writer, None, None
+    if writer is None:
+        return
+    async with _write_lock:
+        # Fold the WAL back into the main file so a clean shutdown leaves one file.
+        try:
+            await writer.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        except aiosqlite.Error:
+            log.warning("WAL checkpoint on shutdown failed", exc_info=True)
+        for conn in (*_reader_conns, writer):
+            await conn.close()
+    _reader_conns.clear()
+    _region_cache.clear()
+    log.info("Closed database")
 
-def _path() -> str:
-    if _db_path is None:
+
+@asynccontextmanager
+async def _read(op: str = "read") -> AsyncIterator[aiosqlite.Connection]:
+    """Borrow a reader connection from the pool for the duration of the block,
+    timed under ``op``."""
+    if _readers is None:
         raise RuntimeError("init_db() must be called before using the database")
-    return _db_path
+    readers = _readers
+    with _DB_SECONDS.time(op=op):
+        conn = await readers.get()
+        try:
+            yield conn
+        finally:
+            readers.put_nowait(conn)
+
+
+@asynccontextmanager
+async def _write() -> AsyncIterator[aiosqlite.Connection]:
+    """Run the block as one transaction on the writer connection.
+
+    Commits on success and rolls back if the block raises.
+    """
+    if _writer is None:
+        raise RuntimeError("init_db() must be called before using the database")
+    with _DB_SECONDS.time(op="write"):
+        async with _write_lock:
+            conn = _writer
+            try:
+                yield conn
+            except BaseException:
+                await conn.rollback()
+                raise
+            await conn.commit()
 
 
 async def get_user_regions(user_id: int) -> list[str]:
     """Return the user's saved region keys, or an empty list if none."""
-    async with aiosqlite.connect(_path()) as conn:
+    # Read-your-writes: a queued write-behind selection wins over the table.
+    for pending in (_pending_regions, _flushing_regions):
+        if user_id in pending:
+            return list(pending[user_id][0])
+    cached = _region_cache.get(user_id)
+    if cached is not None:
+        return list(cached)
+    async with _read() as conn:
         async with conn.execute(
             "SELECT regions FROM user_regions WHERE user_id = ?", (user_id,)
         ) as cur:
             row = await cur.fetchone()
-    if row is None:
-        return []
-    return json.loads(row[0])
+    # Users with nothing saved are cached too, as an empty selection.
+    regions = json.loads(row[0]) if row else []
+    # Don't clobber a newer value that set_user_regions cached while we read.
+    _region_cache.add(user_id, regions)
+    return list(regions)
+
+
+_UPSERT_USER_REGIONS = """
+INSERT INTO user_regions (user_id, regions, updated_at) VALUES (?, ?, ?)
+ON CONFLICT(user_id) DO UPDATE SET
+    regions = excluded.regions,
+    updated_at = excluded.updated_at
+"""
 
 
 async def set_user_regions(user_id: int, regions: list[str]) -> None:
-    """Persist the user's region selection (upsert)."""
-    async with aiosqlite.connect(_path()) as conn:
+    """Persist the user's region selection (upsert).
+
+    In write-behind mode this only queues the write; see :func:`flush`.
+    """
+    regions = list(regions)
+    if _flusher is not None:
+        _pending_regions[user_id] = (regions, _now())
+        _region_cache.put(user_id, regions)
+        _wake_flusher()
+        return
+    async with _write() as conn:
         await conn.execute(
+            _UPSERT_USER_REGIONS, (user_id, json.dumps(regions), _now())
+        )
+    _region_cache.put(user_id, regions)
+
+
+async def _warm_region_cache() -> None:
+    """Pre-load saved selections so the first menu clicks don't touch disk."""
+    async with _read() as conn:
+        async with conn.execute(
             """
-            INSERT INTO user_regions (user_id, regions) VALUES (?, ?)
-            ON CONFLICT(user_id) DO UPDATE SET regions = excluded.regions
+            SELECT user_id, regions FROM user_regions
+            ORDER BY updated_at DESC LIMIT ?
             """,
-            (user_id, json.dumps(regions)),
-        )
-        await conn.commit()
+            (_region_cache.capacity,),
+        ) as cur:
+            async for user_id, regions in cur:
+                _region_cache.add(user_id, json.loads(regions))
+    log.info("Warmed region cache with %d entries", len(_region_cache))
+
+
+def region_cache_stats() -> dict[str, int]:
+    """Size, capacity and hit/miss/eviction counters of the region cache."""
+    return _region_cache.stats()
 
 
 @dataclass(frozen=True)
@@ -88,11 +423,67 @@ class Playtest:
     """A scheduled playtest as stored in the ``playtests`` table."""
 
     id: int
-    user_id: str
-    message_id: str
+    user_id: int
+    message_id: int
     regions: list[str]
     description: str
     code: str
+    # Epoch seconds.
+    created_at: int
+    updated_at: int
+    # The experience embed message in the playtest thread, and a hash of its
+    # rendered content, once one has been posted.
+    embed_message_id: int | None = None
+    embed_hash: str | None = None
+    # Seeds the announcement header's emoji and title (see
+    # ``announcements.pick_announcement_header``).
+    header_seed: int | None = None
+    # Hash of the announcement's rendered content, once known.
+    announcement_hash: str | None = None
+
+
+_PLAYTEST_COLUMNS = """
+    p.id, p.user_id, p.message_id, p.regions, p.description, p.code,
+    p.created_at, p.updated_at, p.embed_message_id, p.embed_hash, p.header_seed,
+    p.announcement_hash
+"""
+
+
+_UPSERT_PLAYTEST = """
+INSERT INTO playtests
+    (user_id, message_id, regions, description, code, created_at, updated_at,
+     header_seed, announcement_hash)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+ON CONFLICT(message_id) DO UPDATE SET
+    user_id = excluded.user_id,
+    regions = excluded.regions,
+    description = excluded.description,
+    code = excluded.code,
+    updated_at = excluded.updated_at,
+    header_seed = COALESCE(excluded.header_seed, playtests.header_seed),
+    announcement_hash = COALESCE(
+        excluded.announcement_hash, playtests.announcement_hash
+    )
+RETURNING id
+"""
+
+
+async def _store_playtest(
+    conn: aiosqlite.Connection, params: tuple, regions: list[str]
+) -> None:
+    """Upsert a playtest row and replace its ``playtest_regions`` rows.
+
+    Runs inside the caller's transaction so both tables always agree.
+    """
+    async with conn.execute(_UPSERT_PLAYTEST, params) as cur:
+        (playtest_id,) = await cur.fetchone()
+    await conn.execute(
+        "DELETE FROM playtest_regions WHERE playtest_id = ?", (playtest_id,)
+    )
+    await conn.executemany(
+        "INSERT OR IGNORE INTO playtest_regions (playtest_id, region) VALUES (?, ?)",
+        [(playtest_id, region) for region in regions],
+    )
 
 
 async def set_playtest(
@@ -101,45 +492,233 @@ async def set_playtest(
     regions: list[str],
     description: str,
     code: str,
+    header_seed: int | None = None,
+    announcement_hash: str | None = None,
 ) -> None:
     """Insert a playtest, or update it in place if one already exists for the
-    announcement message (upsert, keyed on ``message_id``)."""
-    async with aiosqlite.connect(_path()) as conn:
-        await conn.execute(
-            """
-            INSERT INTO playtests (user_id, message_id, regions, description, code)
-            VALUES (?, ?, ?, ?, ?)
-            ON CONFLICT(message_id) DO UPDATE SET
-                user_id = excluded.user_id,
-                regions = excluded.regions,
-                description = excluded.description,
-                code = excluded.code
-            """,
-            (str(user_id), str(message_id), json.dumps(regions), description, code),
-        )
-        await conn.commit()
+    announcement message (upsert, keyed on ``message_id``).
+
+    A ``header_seed`` or ``announcement_hash`` of None keeps the stored one. In
+    write-behind mode this only queues the write; see :func:`flush`.
+    """
+    now = _now()
+    if message_id in _pending_playtests:
+        # Don't let a coalesced update drop values of a still-queued write.
+        queued_seed, queued_hash = _pending_playtests[message_id][0][-2:]
+        header_seed = queued_seed if header_seed is None else header_seed
+        announcement_hash = announcement_hash or queued_hash
+    params = (
+        user_id,
+        message_id,
+        json.dumps(regions),
+        description,
+        code,
+        now,
+        now,
+        header_seed,
+        announcement_hash,
+    )
+    if _flusher is not None:
+        _pending_playtests[message_id] = (params, list(regions))
+        _wake_flusher()
+        return
+    async with _write() as conn:
+        await _store_playtest(conn, params, regions)
 
 
 async def get_playtest(message_id: int) -> Playtest | None:
     """Return the playtest for an announcement message, or None if absent."""
-    async with aiosqlite.connect(_path()) as conn:
+    if message_id in _pending_playtests or message_id in _flushing_playtests:
+        # The row id only exists once the insert lands, so write it out first.
+        await flush()
+    async with _read() as conn:
         async with conn.execute(
-            """
-            SELECT id, user_id, message_id, regions, description, code
-            FROM playtests WHERE message_id = ?
-            """,
-            (str(message_id),),
+            f"SELECT {_PLAYTEST_COLUMNS} FROM playtests AS p WHERE p.message_id = ?",
+            (message_id,),
         ) as cur:
             row = await cur.fetchone()
     if row is None:
         return None
-    id_, user_id, msg_id, regions, description, code = row
-    return Playtest(id_, user_id, msg_id, json.loads(regions), description, code)
+    return _playtest_from_row(row)
+
+
+async def get_playtests_by_region(
+    region: str,
+    *,
+    since: int | None = None,
+    until: int | None = None,
+    limit: int | None = None,
+) -> list[Playtest]:
+    """Return playtests that pinged ``region``, newest first.
+
+    ``since``/``until`` bound ``created_at`` (epoch seconds, inclusive /
+    exclusive). Filtering happens in SQL on the ``playtest_regions`` index.
+    """
+    # The flusher may hold writes that belong in the answer.
+    await flush()
+    async with _read() as conn:
+        async with conn.execute(
+            f"""
+            SELECT {_PLAYTEST_COLUMNS}
+            FROM playtest_regions AS pr
+            JOIN playtests AS p ON p.id = pr.playtest_id
+            WHERE pr.region = :region
+              AND (:since IS NULL OR p.created_at >= :since)
+              AND (:until IS NULL OR p.created_at < :until)
+            ORDER BY p.created_at DESC
+            LIMIT coalesce(:limit, -1)
+            """,
+            {"region": region, "since": since, "until": until, "limit": limit},
+        ) as cur:
+            rows = await cur.fetchall()
+    return [_playtest_from_row(row) for row in rows]
+
+
+async def count_playtests_by_region(
+    *, since: int | None = None, until: int | None = None
+) -> dict[str, int]:
+    """Return how many playtests pinged each region, optionally within a
+    ``created_at`` window (epoch seconds, inclusive / exclusive)."""
+    await flush()
+    async with _read() as conn:
+        async with conn.execute(
+            """
+            SELECT pr.region, count(*)
+            FROM playtest_regions AS pr
+            JOIN playtests AS p ON p.id = pr.playtest_id
+            WHERE (:since IS NULL OR p.created_at >= :since)
+              AND (:until IS NULL OR p.created_at < :until)
+            GROUP BY pr.region
+            ORDER BY count(*) DESC, pr.region
+            """,
+            {"since": since, "until": until},
+        ) as cur:
+            rows = await cur.fetchall()
+    return {region: count for region, count in rows}
+
+
+async def get_active_playtests(since: int) -> list[Playtest]:
+    """Return playtests updated since ``since`` (epoch seconds) that have a
+    posted experience embed, most recently updated first."""
+    await flush()
+    async with _read() as conn:
+        async with conn.execute(
+            f"""
+            SELECT {_PLAYTEST_COLUMNS}
+            FROM playtests AS p
+            WHERE p.updated_at >= ? AND p.embed_message_id IS NOT NULL
+            ORDER BY p.updated_at DESC
+            """,
+            (since,),
+        ) as cur:
+            rows = await cur.fetchall()
+    return [_playtest_from_row(row) for row in rows]
+
+
+async def set_playtest_embed(
+    message_id: int, embed_message_id: int | None, embed_hash: str | None
+) -> None:
+    """Record the experience embed posted for a playtest (or clear it)."""
+    if message_id in _pending_playtests or message_id in _flushing_playtests:
+        # The row has to exist before it can be updated.
+        await flush()
+    async with _write() as conn:
+        await conn.execute(
+            """
+            UPDATE playtests SET embed_message_id = ?, embed_hash = ?
+            WHERE message_id = ?
+            """,
+            (embed_message_id, embed_hash, message_id),
+        )
+
+
+def _playtest_from_row(row: tuple) -> Playtest:
+    id_, user_id, msg_id, regions, *rest = row
+    return Playtest(id_, user_id, msg_id, json.loads(regions), *rest)
+
+
+# --- Write-behind ------------------------------------------------------------
+#
+# Opt-in (``init_db(write_behind=True)``). ``set_user_regions`` and
+# ``set_playtest`` queue their upsert instead of committing inline, coalesced per
+# key so only the latest value for a user / announcement is written. A background
+# flusher writes the queue in one grouped transaction every ``flush_interval``
+# seconds, or as soon as ``flush_batch_size`` writes are waiting. Reads check the
+# queue first, so callers always see their own writes.
+
+_pending_regions: dict[int, tuple[list[str], int]] = {}
+_pending_playtests: dict[int, tuple[tuple, list[str]]] = {}
+# The batch currently being written, still visible to reads until it commits.
+_flushing_regions: dict[int, tuple[list[str], int]] = {}
+_flushing_playtests: dict[int, tuple[tuple, list[str]]] = {}
+_flush_lock = asyncio.Lock()
+_flush_wakeup = asyncio.Event()
+_flusher: asyncio.Task | None = None
+_flusher_running = False
+_flush_interval = 0.5
+_flush_batch_size = 100
+
+
+def _wake_flusher() -> None:
+    if len(_pending_regions) + len(_pending_playtests) >= _flush_batch_size:
+        _flush_wakeup.set()
+
+
+async def flush() -> None:
+    """Write every queued write-behind upsert in a single transaction.
+
+    A no-op when nothing is queued (or write-behind is off). On failure the batch
+    is put back, minus anything superseded meanwhile, to be retried later.
+    """
+    global _pending_regions, _pending_playtests
+    global _flushing_regions, _flushing_playtests
+    async with _flush_lock:
+        if not (_pending_regions or _pending_playtests):
+            return
+        regions, _pending_regions = _pending_regions, {}
+        playtests, _pending_playtests = _pending_playtests, {}
+        _flushing_regions, _flushing_playtests = regions, playtests
+        try:
+            async with _write() as conn:
+                if regions:
+                    await conn.executemany(
+                        _UPSERT_USER_REGIONS,
+                        [
+                            (uid, json.dumps(r), updated_at)
+                            for uid, (r, updated_at) in regions.items()
+                        ],
+                    )
+                for params, playtest_regions in playtests.values():
+                    await _store_playtest(conn, params, playtest_regions)
+        except BaseException:
+            for uid, r in regions.items():
+                _pending_regions.setdefault(uid, r)
+            for mid, params in playtests.items():
+                _pending_playtests.setdefault(mid, params)
+            raise
+        finally:
+            _flushing_regions, _flushing_playtests = {}, {}
+    log.debug(
+        "Flushed %d region and %d playtest writes", len(regions), len(playtests)
+    )
+
+
+async def _flush_loop() -> None:
+    while _flusher_running:
+        try:
+            await asyncio.wait_for(_flush_wakeup.wait(), timeout=_flush_interval)
+        except TimeoutError:
+            pass
+        _flush_wakeup.clear()
+        try:
+            await flush()
+        except Exception:
+            log.exception("Write-behind flush failed; retrying next interval")
 
 
 async def get_state(key: str) -> str | None:
     """Return a stored state value, or None if the key is unset."""
-    async with aiosqlite.connect(_path()) as conn:
+    async with _read() as conn:
         async with conn.execute(
             "SELECT value FROM bot_state WHERE key = ?", (key,)
         ) as cur:
@@ -149,7 +728,7 @@ async def get_state(key: str) -> str | None:
 
 async def set_state(key: str, value: str) -> None:
     """Store a state value (upsert)."""
-    async with aiosqlite.connect(_path()) as conn:
+    async with _write() as conn:
         await conn.execute(
             """
             INSERT INTO bot_state (key, value) VALUES (?, ?)
@@ -157,4 +736,216 @@ async def set_state(key: str, value: str) -> None:
             """,
             (key, value),
         )
-        await conn.commit()
+
+
+async def get_cached_experience(code: str) -> tuple[str | None, int] | None:
+    """Return ``(payload, expires_at)`` for an unexpired cached experience
+    lookup, or None. A None payload is a cached "not found"."""
+    async with _read() as conn:
+        async with conn.execute(
+            "SELECT payload, expires_at FROM experience_cache "
+            "WHERE code = ? AND expires_at > ?",
+            (code, _now()),
+        ) as cur:
+            row = await cur.fetchone()
+    return (row[0], row[1]) if row else None
+
+
+async def set_cached_experience(
+    code: str, payload: str | None, expires_at: int, *, max_rows: int = 5000
+) -> None:
+    """Store an experience lookup result (upsert), then drop expired entries and,
+    only once the table is over ``max_rows``, the excess entries expiring first.
+    Both deletes walk the ``expires_at`` index rather than the whole table."""
+    async with _write() as conn:
+        await conn.execute(
+            """
+            INSERT INTO experience_cache (code, payload, expires_at) VALUES (?, ?, ?)
+            ON CONFLICT(code) DO UPDATE SET
+                payload = excluded.payload,
+                expires_at = excluded.expires_at
+            """,
+            (code, payload, expires_at),
+        )
+        await conn.execute(
+            "DELETE FROM experience_cache WHERE expires_at <= ?", (_now(),)
+        )
+        async with conn.execute("SELECT COUNT(*) FROM experience_cache") as cur:
+            (count,) = await cur.fetchone()
+        if count > max_rows:
+            await conn.execute(
+                """
+                DELETE FROM experience_cache WHERE code IN (
+                    SELECT code FROM experience_cache ORDER BY expires_at LIMIT ?
+                )
+                """,
+                (count - max_rows,),
+            )
+
+
+# --- Export and retention ----------------------------------------------------
+
+EXPORT_FORMATS = ("jsonl", "csv")
+
+
+async def iter_playtests(*, before: int | None = None) -> AsyncIterator[Playtest]:
+    """Yield every playtest (optionally only those created before ``before``),
+    oldest first.
+
+    Rows are streamed from the cursor in small chunks, so memory use stays flat
+    however large the table is. Holds one pooled reader until exhausted.
+    """
+    await flush()
+    # Timed separately: the connection is held for as long as the consumer
+    # takes, which would swamp the latency of ordinary reads.
+    async with _read(op="stream") as conn:
+        async with conn.execute(
+            f"""
+            SELECT {_PLAYTEST_COLUMNS}
+            FROM playtests AS p
+            WHERE :before IS NULL OR p.created_at < :before
+            ORDER BY p.id
+            """,
+            {"before": before},
+        ) as cur:
+            async for row in cur:
+                yield _playtest_from_row(row)
+
+
+def _write_record(writer: csv.DictWriter | TextIO, playtest: Playtest) -> None:
+    record = asdict(playtest)
+    if isinstance(writer, csv.DictWriter):
+        record["regions"] = json.dumps(record["regions"])
+        writer.writerow(record)
+    else:
+        writer.write(json.dumps(record) + "\n")
+
+
+async def export_playtests(
+    out: TextIO, fmt: str = "jsonl", *, before: int | None = None
+) -> int:
+    """Stream playtests to ``out`` as JSON lines or CSV; return the row count.
+
+    In CSV the ``regions`` list is written as a JSON array in a single cell.
+    """
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format {fmt!r}")
+    writer: csv.DictWriter | TextIO = out
+    if fmt == "csv":
+        writer = csv.DictWriter(out, fieldnames=[f.name for f in fields(Playtest)])
+        writer.writeheader()
+    count = 0
+    async for playtest in iter_playtests(before=before):
+        _write_record(writer, playtest)
+        count += 1
+    return count
+
+
+def _append_archive(path: str, playtests: list[Playtest]) -> None:
+    with open(path, "a", encoding="utf-8") as archive:
+        for playtest in playtests:
+            _write_record(archive, playtest)
+
+
+async def prune_playtests(
+    older_than: int,
+    *,
+    batch_size: int = 100,
+    archive: str | None = None,
+    pause: float = 0.05,
+) -> int:
+    """Delete playtests created more than ``older_than`` seconds ago; return how
+    many were removed.
+
+    Works in batches of ``batch_size``, each its own short write transaction with
+    a ``pause`` in between, so interaction writes never queue behind one long
+    lock. With ``archive`` (a file path), each batch is appended there as JSON
+    lines once its delete has committed, from a worker thread and outside the
+    transaction, so a failed or cancelled delete never archives rows twice.
+    Their ``playtest_regions`` rows go with them (ON DELETE CASCADE).
+    """
+    cutoff = _now() - older_than
+    await flush()
+    total = 0
+    while True:
+        async with _write() as conn:
+            async with conn.execute(
+                f"""
+                SELECT {_PLAYTEST_COLUMNS}
+                FROM playtests AS p
+                WHERE p.created_at < ?
+                ORDER BY p.created_at
+                LIMIT ?
+                """,
+                (cutoff, batch_size),
+            ) as cur:
+                rows = await cur.fetchall()
+            if not rows:
+                break
+            await conn.executemany(
+                "DELETE FROM playtests WHERE id = ?", [(row[0],) for row in rows]
+            )
+        if archive is not None:
+            pruned = [_playtest_from_row(row) for row in rows]
+            await asyncio.to_thread(_append_archive, archive, pruned)
+        total += len(rows)
+        if len(rows) < batch_size:
+            break
+        await asyncio.sleep(pause)
+    if total:
+        log.info("Pruned %d playtests created before %d", total, cutoff)
+    return total
+
+
+async def _cli(args: argparse.Namespace) -> int:
+    if args.db is None:
+        # Imported lazily: the settings require the bot's full environment.
+        from .config import env
+
+        args.db = env.BOT_SETTINGS.DB_PATH
+    await init_db(args.db, read_pool_size=1, region_cache_size=0)
+    try:
+        if args.command == "export":
+            if args.output == "-":
+                count = await export_playtests(sys.stdout, args.format)
+            else:
+                with open(args.output, "w", newline="", encoding="utf-8") as out:
+                    count = await export_playtests(out, args.format)
+            log.info("Exported %d playtests", count)
+        else:
+            older_than = int(args.older_than_days * 86400)
+            await prune_playtests(
+                older_than, batch_size=args.batch_size, archive=args.archive
+            )
+    finally:
+        await close_db()
+    return 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    """``python -m app.db export|prune``: dump or prune the playtests table."""
+    parser = argparse.ArgumentParser(prog="python -m app.db", description=main.__doc__)
+    parser.add_argument("--db", help="database path (default: BOT_SETTINGS.DB_PATH)")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    export = sub.add_parser("export", help="stream every playtest to a file")
+    export.add_argument("--format", choices=EXPORT_FORMATS, default="jsonl")
+    export.add_argument(
+        "--output", "-o", default="-", help="file path, or - for stdout"
+    )
+
+    prune = sub.add_parser(
+        "prune", help="delete (and optionally archive) old playtests"
+    )
+    prune.add_argument("--older-than-days", type=float, required=True)
+    prune.add_argument("--archive", help="append pruned rows to this JSONL file")
+    prune.add_argument("--batch-size", type=int, default=100)
+
+    args = parser.parse_args(argv)
+    # Logs go to stderr so an export to stdout stays clean.
+    logging.basicConfig(level=logging.INFO, format="%(levelname)-8s %(message)s")
+    return asyncio.run(_cli(args))
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,263 @@
+"""A bounded, supervised executor for the bot's background work.
+
+Work that shouldn't hold up an interaction (posting an experience embed, say) is
+submitted here instead of being spawned as a bare task:
+
+- a fixed number of workers bounds how much runs at once;
+- waiting work is bounded too: :meth:`TaskExecutor.submit` waits for room
+  (backpressure) and :meth:`TaskExecutor.submit_nowait` refuses when full. A
+  job holds its slot until it starts running, including while it waits behind
+  another job with the same key;
+- jobs submitted with the same ``key`` (e.g. a thread id) run one at a time in
+  submission order, without tying up other workers while they wait;
+- failures are logged and counted, and queue depth and wait/run times are
+  tracked for :meth:`TaskExecutor.stats`;
+- work that has to run as its own task (a flow whose later steps finish after
+  the user has been answered, say) is registered with
+  :meth:`TaskExecutor.track` so shutdown waits for it too;
+- :meth:`TaskExecutor.drain` lets tracked tasks and queued work finish, up to a
+  timeout, when the bot shuts down.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from collections import deque
+from collections.abc import Coroutine, Hashable
+from dataclasses import dataclass, field
+from typing import Any
+
+log = logging.getLogger(__name__)
+
+
+@dataclass(slots=True)
+class _Job:
+    coro: Coroutine[Any, Any, Any]
+    name: str
+    key: Hashable | None
+    submitted: float = field(default_factory=time.monotonic)
+
+
+class TaskExecutor:
+    def __init__(
+        self, *, workers: int = 4, queue_size: int = 100, name: str = "executor"
+    ) -> None:
+        self.name = name
+        self.workers = max(workers, 1)
+        self._queue: asyncio.Queue[_Job] = asyncio.Queue()
+        # Free slots for jobs waiting to run, whether queued or chained behind
+        # their key; _room is set while there are any.
+        self._free = max(queue_size, 1)
+        self._room = asyncio.Event()
+        self._room.set()
+        # Key -> jobs waiting behind the job with that key currently running.
+        self._chained: dict[Hashable, deque[_Job]] = {}
+        self._tasks: list[asyncio.Task[None]] = []
+        self._tracked: set[asyncio.Task[Any]] = set()
+        self._unfinished = 0
+        self._idle = asyncio.Event()
+        self._idle.set()
+        self._accepting = False
+        self._counters = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "rejected": 0,
+            "dropped": 0,
+            "running": 0,
+            "tracked": 0,
+        }
+        self._wait_total = 0.0
+        self._wait_max = 0.0
+        self._run_total = 0.0
+
+    def start(self) -> None:
+        if self._tasks:
+            return
+        self._accepting = True
+        self._tasks = [
+            asyncio.create_task(self._worker(), name=f"{self.name}-{i}")
+            for i in range(self.workers)
+        ]
+
+    def _job(
+        self, coro: Coroutine[Any, Any, Any], key: Hashable | None, name: str | None
+    ) -> _Job | None:
+        name = name or getattr(coro, "__qualname__", "job")
+        if not self._accepting:
+            log.warning("%s not accepting work; dropping %s", self.name, name)
+            coro.close()
+            self._counters["rejected"] += 1
+            return None
+        return _Job(coro, name, key)
+
+    def _take_slot(self) -> bool:
+        if not self._free:
+            return False
+        self._free -= 1
+        if not self._free:
+            self._room.clear()
+        return True
+
+    def _free_slot(self) -> None:
+        self._free += 1
+        self._room.set()
+
+    def _accepted(self) -> None:
+        self._counters["submitted"] += 1
+        self._unfinished += 1
+        self._idle.clear()
+
+    async def submit(
+        self,
+        coro: Coroutine[Any, Any, Any],
+        *,
+        key: Hashable | None = None,
+        name: str | None = None,
+    ) -> bool:
+        """Queue ``coro``, waiting while the queue is full. Returns False if the
+        executor isn't accepting work (not started or draining)."""
+        job = self._job(coro, key, name)
+        if job is None:
+            return False
+        try:
+            while not self._take_slot():
+                await self._room.wait()
+        except asyncio.CancelledError:
+            job.coro.close()
+            raise
+        self._queue.put_nowait(job)
+        self._accepted()
+        return True
+
+    def submit_nowait(
+        self,
+        coro: Coroutine[Any, Any, Any],
+        *,
+        key: Hashable | None = None,
+        name: str | None = None,
+    ) -> bool:
+        """Queue ``coro`` if there's room; otherwise drop it and return False."""
+        job = self._job(coro, key, name)
+        if job is None:
+            return False
+        if not self._take_slot():
+            log.warning("%s queue full; dropping %s", self.name, job.name)
+            job.coro.close()
+            self._counters["rejected"] += 1
+            return False
+        self._queue.put_nowait(job)
+        self._accepted()
+        return True
+
+    def track(self, task: asyncio.Task[Any]) -> asyncio.Task[Any]:
+        """Have :meth:`drain` wait for ``task`` (which may still submit work)
+        before it stops accepting work. Returns ``task``."""
+        if not task.done():
+            self._tracked.add(task)
+            task.add_done_callback(self._tracked.discard)
+            self._counters["tracked"] += 1
+        return task
+
+    async def _worker(self) -> None:
+        while True:
+            job = await self._queue.get()
+            self._queue.task_done()
+            if job.key is not None:
+                if job.key in self._chained:
+                    # Another worker is running this key; it picks this up next.
+                    self._chained[job.key].append(job)
+                    continue
+                self._chained[job.key] = deque()
+            try:
+                await self._run(job)
+                while job.key is not None and self._chained[job.key]:
+                    await self._run(self._chained[job.key].popleft())
+            finally:
+                if job.key is not None:
+                    for dropped in self._chained.pop(job.key):
+                        # Only reached when the worker is cancelled mid-chain.
+                        self._dropped(dropped)
+
+    async def _run(self, job: _Job) -> None:
+        self._free_slot()
+        started = time.monotonic()
+        waited = started - job.submitted
+        self._wait_total += waited
+        self._wait_max = max(self._wait_max, waited)
+        self._counters["running"] += 1
+        outcome = "completed"
+        try:
+            await job.coro
+        except asyncio.CancelledError:
+            outcome = "dropped"
+            raise
+        except Exception:
+            outcome = "failed"
+            log.exception("%s job %s failed", self.name, job.name)
+        finally:
+            self._counters["running"] -= 1
+            self._run_total += time.monotonic() - started
+            self._finished(outcome)
+
+    def _dropped(self, job: _Job) -> None:
+        job.coro.close()
+        self._free_slot()
+        self._finished("dropped")
+
+    def _finished(self, outcome: str) -> None:
+        self._counters[outcome] += 1
+        self._unfinished -= 1
+        if self._unfinished == 0:
+            self._idle.set()
+
+    async def drain(self, timeout: float) -> None:
+        """Wait for tracked tasks, stop accepting work, and wait for queued and
+        running jobs to finish; after ``timeout`` seconds in all, cancel whatever
+        is left."""
+        deadline = time.monotonic() + timeout
+        # Tracked tasks may submit more work (or start tasks that are tracked in
+        # turn), so only stop accepting once they're done.
+        while self._tracked and (remaining := deadline - time.monotonic()) > 0:
+            await asyncio.wait(set(self._tracked), timeout=remaining)
+        if self._tracked:
+            log.warning(
+                "%s drain timed out with %d tracked task(s) unfinished",
+                self.name,
+                len(self._tracked),
+            )
+            tracked = list(self._tracked)
+            for task in tracked:
+                task.cancel()
+            await asyncio.gather(*tracked, return_exceptions=True)
+        self._accepting = False
+        try:
+            if not self._idle.is_set():
+                await asyncio.wait_for(
+                    self._idle.wait(), max(deadline - time.monotonic(), 0)
+                )
+        except TimeoutError:
+            log.warning(
+                "%s drain timed out with %d job(s) unfinished",
+                self.name,
+                self._unfinished,
+            )
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        while not self._queue.empty():
+            self._dropped(self._queue.get_nowait())
+
+    def stats(self) -> dict[str, float]:
+        started = self._counters["completed"] + self._counters["failed"]
+        return self._counters | {
+            "tracking": len(self._tracked),
+            "queued": self._queue.qsize()
+            + sum(len(chain) for chain in self._chained.values()),
+            "avg_wait_ms": self._wait_total / started * 1000 if started else 0.0,
+            "max_wait_ms": self._wait_max * 1000,
+            "avg_run_ms": self._run_total / started * 1000 if started else 0.0,
+        }
@@ -0,0 +1,281 @@
+"""In-process latency metrics, served in the Prometheus text format.
+
+Histograms are plain in-memory bucket counters, cheap enough to observe from
+the event loop on every call:
+
+- interactions (:func:`track_interaction`): the time from Discord creating the
+  interaction until we acknowledge it (``send_modal`` / ``defer`` / a reply),
+  which has to stay under Discord's 3 second deadline, and total handler time;
+- stages of multi-step flows, such as the modal submits;
+- database connection use, reads and writes;
+- outgoing HTTP requests, both Discord's REST API and the gametools API, via
+  :func:`http_trace`.
+
+The ``*_stats()`` functions scattered around the bot can be registered with
+:func:`register_stats` and are exported as gauges. :func:`start_server` serves
+everything at ``/metrics`` from the bot's own event loop when
+``BOT_SETTINGS__METRICS_PORT`` is set.
+"""
+
+from __future__ import annotations
+
+import bisect
+import contextlib
+import logging
+import re
+import time
+from collections.abc import Callable, Iterator, Mapping
+from typing import TYPE_CHECKING
+
+import aiohttp
+from aiohttp import web
+
+if TYPE_CHECKING:
+    import discord
+
+log = logging.getLogger(__name__)
+
+# Milliseconds since the Unix epoch at which Discord snowflakes start.
+DISCORD_EPOCH_MS = 1_420_070_400_000
+
+# Seconds. Dense around Discord's 3s interaction deadline.
+DEFAULT_BUCKETS = (
+    0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 1.5, 2.0, 2.5, 3.0, 5.0, 10.0,
+)  # fmt: skip
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(pairs: list[tuple[str, str]]) -> str:
+    rendered = ",".join(f'{name}="{_escape(value)}"' for name, value in pairs)
+    return f"{{{rendered}}}" if rendered else ""
+
+
+class Histogram:
+    """A labelled histogram with fixed buckets."""
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labels: tuple[str, ...] = (),
+        buckets: tuple[float, ...] = DEFAULT_BUCKETS,
+    ) -> None:
+        self.name = name
+        self.help = help
+        self.labels = labels
+        self.buckets = buckets
+        # Label values -> per-bucket counts (last is +Inf), sum.
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = tuple(str(labels.get(name, "")) for name in self.labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+        counts, total = series
+        counts[bisect.bisect_left(self.buckets, value)] += 1
+        total[0] += value
+
+    @contextlib.contextmanager
+    def time(self, **labels: str) -> Iterator[None]:
+        """Observe how long the block takes."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        for key, (counts, total) in sorted(self._series.items()):
+            base = list(zip(self.labels, key))
+            cumulative = 0
+            for bound, count in zip((*self.buckets, "+Inf"), counts):
+                cumulative += count
+                le = _labels([*base, ("le", str(bound))])
+                lines.append(f"{self.name}_bucket{le} {cumulative}")
+            lines.append(f"{self.name}_sum{_labels(base)} {total[0]}")
+            lines.append(f"{self.name}_count{_labels(base)} {cumulative}")
+        return lines
+
+
+_histograms: dict[str, Histogram] = {}
+# Metric name prefix -> (help, stats function).
+_stats: dict[str, tuple[str, Callable[[], Mapping[str, object]]]] = {}
+
+
+def histogram(name: str, help: str, labels: tuple[str, ...] = ()) -> Histogram:
+    """Get or create the histogram called ``name``."""
+    if name not in _histograms:
+        _histograms[name] = Histogram(name, help, labels)
+    return _histograms[name]
+
+
+def register_stats(
+    prefix: str, func: Callable[[], Mapping[str, object]], help: str
+) -> None:
+    """Export every numeric value of ``func()`` as a gauge named
+    ``<prefix>_<key>`` on each scrape."""
+    _stats[prefix] = (help, func)
+
+
+INTERACTION_ACK = histogram(
+    "ranger_interaction_ack_seconds",
+    "Time from an interaction's creation until it was acknowledged.",
+    ("handler",),
+)
+INTERACTION_HANDLER = histogram(
+    "ranger_interaction_handler_seconds",
+    "Time spent in an interaction handler.",
+    ("handler",),
+)
+STAGE = histogram(
+    "ranger_stage_seconds",
+    "Duration of each stage of a multi-step flow.",
+    ("flow", "stage"),
+)
+DB = histogram(
+    "ranger_db_seconds",
+    "Time holding a database connection, including waiting for one.",
+    ("op",),
+)
+HTTP = histogram(
+    "ranger_http_request_seconds",
+    "Outgoing HTTP request duration.",
+    ("host", "method", "route", "status"),
+)
+
+
+# --- Interactions ------------------------------------------------------------
+
+# Interaction id -> handler name, for handlers that haven't acknowledged yet.
+_unacked: dict[int, str] = {}
+
+
+def _age(interaction: discord.Interaction) -> float:
+    """Seconds since Discord created the interaction (from its snowflake id)."""
+    created = ((interaction.id >> 22) + DISCORD_EPOCH_MS) / 1000
+    return max(time.time() - created, 0.0)
+
+
+@contextlib.contextmanager
+def track_interaction(
+    handler: str, interaction: discord.Interaction
+) -> Iterator[None]:
+    """Time an interaction handler. Call :func:`acked` right after the handler
+    acknowledges the interaction; if it doesn't, an acknowledgement made by the
+    time the block exits is recorded then."""
+    _unacked[interaction.id] = handler
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        INTERACTION_HANDLER.observe(time.perf_counter() - start, handler=handler)
+        if interaction.id in _unacked and interaction.response.is_done():
+            acked(interaction)
+        _unacked.pop(interaction.id, None)
+
+
+def acked(interaction: discord.Interaction) -> None:
+    """Record that the tracked ``interaction`` has just been acknowledged."""
+    handler = _unacked.pop(interaction.id, None)
+    if handler is not None:
+        INTERACTION_ACK.observe(_age(interaction), handler=handler)
+
+
+# --- HTTP --------------------------------------------------------------------
+
+# Collapse snowflakes and tokens in URL paths so each route is one series.
+_ID_SEGMENT = re.compile(r"/(\d{5,}|[A-Za-z0-9_-]{60,})(?=/|$)")
+
+
+def _route(path: str) -> str:
+    return _ID_SEGMENT.sub("/:id", path)
+
+
+def http_trace() -> aiohttp.TraceConfig:
+    """A trace config that records every request made through the session."""
+
+    async def on_start(session, context, params) -> None:
+        context.start = time.perf_counter()
+
+    async def on_end(session, context, params) -> None:
+        HTTP.observe(
+            time.perf_counter() - context.start,
+            host=params.url.host or "",
+            method=params.method,
+            route=_route(params.url.path),
+            status=str(params.response.status),
+        )
+
+    async def on_exception(session, context, params) -> None:
+        HTTP.observe(
+            time.perf_counter() - context.start,
+            host=params.url.host or "",
+            method=params.method,
+            route=_route(params.url.path),
+            status="error",
+        )
+
+    trace = aiohttp.TraceConfig()
+    trace.on_request_start.append(on_start)
+    trace.on_request_end.append(on_end)
+    trace.on_request_exception.append(on_exception)
+    return trace
+
+
+# --- Exposition ----------------------------------------------------------------
+
+
+def render() -> str:
+    """Every metric in the Prometheus text exposition format."""
+    lines: list[str] = []
+    for hist in _histograms.values():
+        lines.extend(hist.render())
+    for prefix, (help, func) in _stats.items():
+        try:
+            values = func()
+        except Exception:
+            log.exception("Stats for %s failed", prefix)
+            continue
+        for key, value in values.items():
+            if isinstance(value, bool) or not isinstance(value, (int, float)):
+                continue
+            name = re.sub(r"[^a-zA-Z0-9_]", "_", f"{prefix}_{key}")
+            lines.extend(
+                [f"# HELP {name} {help}", f"# TYPE {name} gauge", f"{name} {value}"]
+            )
+    return "\n".join(lines) + "\n"
+
+
+_runner: web.AppRunner | None = None
+
+
+async def start_server(host: str, port: int) -> None:
+    """Serve :func:`render` at ``http://host:port/metrics``."""
+    global _runner
+
+    async def metrics(request: web.Request) -> web.Response:
+        return web.Response(text=render(), content_type="text/plain", charset="utf-8")
+
+    app = web.Application()
+    app.router.add_get("/metrics", metrics)
+    runner = web.AppRunner(app, access_log=None)
+    await runner.setup()
+    try:
+        await web.TCPSite(runner, host, port).start()
+    except BaseException:
+        await runner.cleanup()
+        raise
+    _runner = runner
+    log.info("Serving metrics on http://%s:%s/metrics", host, port)
+
+
+async def stop_server() -> None:
+    global _runner
+    runner, _runner = _runner, None
+    if runner is not None:
+        await runner.cleanup()
@@ -0,0 +1,80 @@
+"""Startup timeline.
+
+Records when each step of bringing the bot up started and how long it took,
+relative to the moment this module was first imported (which
+:mod:`app.__main__` does before anything else), so cold starts and restarts
+after a crash can be compared over time:
+
+    with startup.stage("db"):
+        await init_db(...)
+    startup.mark("ready")
+    startup.report()
+
+Stages may overlap (the database opens while cogs load). :func:`report` logs the
+timeline once, and :func:`startup_stats` exports it for :mod:`app.metrics`.
+"""
+
+from __future__ import annotations
+
+import contextlib
+import logging
+import time
+from collections.abc import Iterator
+
+log = logging.getLogger(__name__)
+
+_origin = time.perf_counter()
+# Name -> (start offset, duration) in seconds; marks have no duration.
+_timeline: dict[str, tuple[float, float | None]] = {}
+_reported = False
+
+
+def elapsed() -> float:
+    """Seconds since startup began."""
+    return time.perf_counter() - _origin
+
+
+@contextlib.contextmanager
+def stage(name: str) -> Iterator[None]:
+    """Record how long the block takes as stage ``name``."""
+    start = elapsed()
+    try:
+        yield
+    finally:
+        _timeline[name] = (start, elapsed() - start)
+
+
+def mark(name: str) -> None:
+    """Record that startup reached ``name`` (the first time only)."""
+    _timeline.setdefault(name, (elapsed(), None))
+
+
+def timeline() -> list[tuple[str, float, float | None]]:
+    """``(name, start offset, duration or None)`` in order of start."""
+    return sorted(
+        ((name, start, duration) for name, (start, duration) in _timeline.items()),
+        key=lambda entry: entry[1],
+    )
+
+
+def report() -> None:
+    """Log the timeline, once."""
+    global _reported
+    if _reported:
+        return
+    _reported = True
+    entries = ", ".join(
+        f"{name} @{start * 1000:.0f}ms"
+        if duration is None
+        else f"{name} {duration * 1000:.0f}ms @{start * 1000:.0f}ms"
+        for name, start, duration in timeline()
+    )
+    log.info("Started in %.0fms: %s", elapsed() * 1000, entries)
+
+
+def startup_stats() -> dict[str, float]:
+    """Seconds from startup until each stage ended (or each mark was reached)."""
+    return {
+        f"{name}_seconds": start + (duration or 0.0)
+        for name, start, duration in timeline()
+    }
@@ -0,0 +1,12 @@
+"""Shared test setup.
+
+``app.config`` builds its settings at import time, so the required ones get
+placeholder values before any test imports the app.
+"""
+
+import os
+
+os.environ.setdefault("BOT_SETTINGS__DISCORD_TOKEN", "test-token")
+os.environ.setdefault("BOT_SETTINGS__GUILD_ID", "1")
+os.environ.setdefault("PLAYTEST_COG_SETTINGS__MENU_CHANNEL_ID", "2")
+os.environ.setdefault("PLAYTEST_COG_SETTINGS__ANNOUNCE_CHANNEL_ID", "3")
@@ -0,0 +1,25 @@
+import asyncio
+import time
+
+from app import db
+
+
+def test_experience_cache_trims_only_the_rows_over_the_cap(tmp_path):
+    async def scenario():
+        await db.init_db(str(tmp_path / "test.db"), region_cache_size=0)
+        try:
+            now = int(time.time())
+            await db.set_cached_experience("OLD", None, now - 1, max_rows=3)
+            for n in range(3):
+                await db.set_cached_experience(f"C{n}", "{}", now + 10 + n, max_rows=3)
+            # Expired rows go first; nothing else is over the cap yet.
+            assert await db.get_cached_experience("C0") is not None
+
+            await db.set_cached_experience("C3", "{}", now + 100, max_rows=3)
+            assert await db.get_cached_experience("C0") is None
+            for code in ("C1", "C2", "C3"):
+                assert await db.get_cached_experience(code) is not None
+        finally:
+            await db.close_db()
+
+    asyncio.run(scenario())
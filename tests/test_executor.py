@@ -0,0 +1,37 @@
+import asyncio
+
+from app.executor import TaskExecutor
+
+
+def test_jobs_chained_on_one_key_count_against_the_queue_bound():
+    async def scenario():
+        executor = TaskExecutor(workers=2, queue_size=3)
+        executor.start()
+        release = asyncio.Event()
+        ran = []
+
+        async def job(n):
+            await release.wait()
+            ran.append(n)
+
+        # The first job starts running; the next three wait behind it on the
+        # same key and fill every slot, even though the queue itself is empty.
+        assert await executor.submit(job(0), key="thread")
+        await asyncio.sleep(0)
+        for n in range(1, 4):
+            assert await executor.submit(job(n), key="thread")
+        await asyncio.sleep(0)
+        assert executor.stats()["queued"] == 3
+
+        assert not executor.submit_nowait(job(4), key="thread")
+        blocked = asyncio.create_task(executor.submit(job(5), key="thread"))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+
+        release.set()
+        assert await asyncio.wait_for(blocked, 1)
+        await executor.drain(1)
+        assert ran == [0, 1, 2, 3, 5]
+        assert executor.stats()["rejected"] == 1
+
+    asyncio.run(scenario())
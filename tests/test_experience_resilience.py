@@ -0,0 +1,178 @@
+"""Experience lookups against the gametools stub's failure modes: retries,
+``Retry-After``, the circuit breaker, and how each outcome reaches the user."""
+
+import asyncio
+import contextlib
+import sys
+import time
+from pathlib import Path
+
+import aiohttp
+import pytest
+from aiohttp import web
+
+from app import db
+from app.cogs.playtest import experience
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1] / "benchmarks"))
+from gametools_stub import ROUTE, make_app  # noqa: E402
+
+
+@contextlib.asynccontextmanager
+async def stub(tmp_path, *, stub_options=None, **requests):
+    """Run the stub and point a fresh cache and request policy at it."""
+    runner = web.AppRunner(make_app(**(stub_options or {})))
+    await runner.setup()
+    await web.TCPSite(runner, "127.0.0.1", 0).start()
+    port = runner.addresses[0][1]
+    await db.init_db(str(tmp_path / "test.db"), region_cache_size=0)
+    await experience.open_session()
+    experience.configure_cache(size=64, ttl=3600, negative_ttl=300, max_persisted=100)
+    experience.configure_requests(
+        api_url=f"http://127.0.0.1:{port}{ROUTE}", rate=1000, burst=1000, **requests
+    )
+    try:
+        yield
+    finally:
+        await experience.close_session()
+        await db.close_db()
+        await runner.cleanup()
+
+
+def requests_made() -> int:
+    return experience.request_stats()["requests"]
+
+
+def breaker_state() -> str:
+    return experience.request_stats()["breaker_state"]
+
+
+class FakeThread:
+    id = 1
+
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, content=None, *, embed=None):
+        self.sent.append(content if embed is None else embed)
+        return self
+
+
+@pytest.fixture(autouse=True)
+def no_backoff(monkeypatch):
+    monkeypatch.setattr(experience, "backoff_delay", lambda attempt: 0.0)
+
+
+def test_found_and_unknown_codes_are_cached(tmp_path):
+    async def scenario():
+        async with stub(tmp_path):
+            before = requests_made()
+            found = await experience.fetch_experience("abc123")
+            assert found is not None and found.name
+            assert await experience.fetch_experience("NONE") is None
+            assert await experience.fetch_experience("E404") is None
+            assert requests_made() - before == 3
+            # All three come from the cache now, including both not-found ones.
+            await experience.fetch_experience("ABC123")
+            await experience.fetch_experience("none")
+            await experience.fetch_experience("e404")
+            assert requests_made() - before == 3
+            assert breaker_state() == "closed"
+
+    asyncio.run(scenario())
+
+
+def test_server_errors_are_retried_then_unavailable_and_not_cached(tmp_path):
+    async def scenario():
+        async with stub(tmp_path, max_attempts=3):
+            before = requests_made()
+            with pytest.raises(experience.ExperienceUnavailable):
+                await experience.fetch_experience("E503")
+            assert requests_made() - before == 3
+            with pytest.raises(experience.ExperienceUnavailable):
+                await experience.fetch_experience("E503")
+            assert requests_made() - before == 6
+
+    asyncio.run(scenario())
+
+
+def test_flaky_upstream_succeeds_on_retry(tmp_path):
+    async def scenario():
+        async with stub(tmp_path, stub_options={"flaky_failures": 2}, max_attempts=3):
+            before = requests_made()
+            assert await experience.fetch_experience("FLAKY") is not None
+            assert requests_made() - before == 3
+            assert breaker_state() == "closed"
+
+    asyncio.run(scenario())
+
+
+def test_retry_after_is_honoured(tmp_path):
+    async def scenario():
+        async with stub(tmp_path, max_attempts=2):
+            start = time.monotonic()
+            with pytest.raises(experience.ExperienceUnavailable):
+                await experience.fetch_experience("E429")
+            # The stub sends Retry-After: 1; backoff alone would be 0 here.
+            assert time.monotonic() - start >= 0.9
+
+    asyncio.run(scenario())
+
+
+def test_timeout_is_unavailable(tmp_path, monkeypatch):
+    monkeypatch.setattr(
+        experience, "REQUEST_TIMEOUT", aiohttp.ClientTimeout(total=0.2)
+    )
+
+    async def scenario():
+        async with stub(tmp_path, stub_options={"slow_delay": 2}, max_attempts=2):
+            before = requests_made()
+            with pytest.raises(experience.ExperienceUnavailable):
+                await experience.fetch_experience("SLOW")
+            assert requests_made() - before == 2
+
+    asyncio.run(scenario())
+
+
+def test_breaker_opens_fails_fast_and_recovers_through_half_open(tmp_path):
+    async def scenario():
+        async with stub(
+            tmp_path, max_attempts=1, failure_threshold=2, reset_timeout=0.2
+        ):
+            for _ in range(2):
+                with pytest.raises(experience.ExperienceUnavailable):
+                    await experience.fetch_experience("E500")
+            assert breaker_state() == "open"
+
+            # Open: rejected without a request, even for a healthy code.
+            before = requests_made()
+            with pytest.raises(experience.ExperienceUnavailable):
+                await experience.fetch_experience("ABC123")
+            assert requests_made() == before
+            assert experience.request_stats()["breaker_rejections"] == 1
+
+            # Half-open: a failed probe opens it again...
+            await asyncio.sleep(0.25)
+            with pytest.raises(experience.ExperienceUnavailable):
+                await experience.fetch_experience("E500")
+            assert breaker_state() == "open"
+            assert experience.request_stats()["breaker_trips"] == 2
+
+            # ...and a successful one closes it.
+            await asyncio.sleep(0.25)
+            assert await experience.fetch_experience("ABC123") is not None
+            assert breaker_state() == "closed"
+
+    asyncio.run(scenario())
+
+
+def test_outage_and_unknown_code_are_reported_differently(tmp_path):
+    async def scenario():
+        async with stub(tmp_path, max_attempts=1):
+            outage, unknown = FakeThread(), FakeThread()
+            await experience.post_experience_embed(outage, "E503")
+            await experience.post_experience_embed(unknown, "E404")
+            assert "temporarily unavailable" in outage.sent[0]
+            assert "Couldn't find an experience" in unknown.sent[0]
+
+    asyncio.run(scenario())
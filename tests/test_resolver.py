@@ -0,0 +1,23 @@
+import importlib
+import json
+
+from app.cogs.playtest import resolver
+from app.config import env
+
+
+def test_reload_picks_up_edited_regions_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(env.PLAYTEST_COG_SETTINGS, "REGIONS_CONFIG_DIR", str(tmp_path))
+    path = tmp_path / f"regions.{env.BOT_SETTINGS.GUILD_ID}.json"
+    path.write_text(json.dumps({"EU": 10}))
+    resolver.clear()
+    assert resolver.regions() == {"EU": 10}
+
+    path.write_text(json.dumps({"EU": 10, "NA": 20}))
+    assert resolver.regions() == {"EU": 10}  # cached until the cog reloads
+
+    # What reloading the extension does: cog_unload clears, then the cog's
+    # modules are imported again.
+    resolver.clear()
+    reloaded = importlib.reload(resolver)
+    assert reloaded.regions() == {"EU": 10, "NA": 20}
+    reloaded.clear()